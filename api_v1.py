@@ -0,0 +1,296 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+import async_crud
+import idempotency
+import schemas
+from async_crud import AnySession
+from auth import require_role
+from crud import action_conditions, incident_conditions
+from database import get_db, get_read_db
+from identity import Identity
+from models import DisciplinaryAction, DisciplineIncident, StaffMember, Student
+
+# JSON API mirroring the HTML CRUD routes. Lists use keyset pagination
+# (?after=<next_cursor>&limit=N) and ?fields=a,b to select columns; the
+# selected columns are read as plain rows and serialized with orjson, so no
+# ORM objects or response-model validation sit on the read path. Auth is the
+# same session cookie the pages use (POST /login).
+
+router = APIRouter(prefix="/api/v1", default_response_class=ORJSONResponse, tags=["api v1"])
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def selected_fields(schema, fields: str | None):
+    available = list(schema.model_fields)
+    if not fields:
+        return available
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(available)}"
+        )
+    # id is always returned; it is the pagination cursor
+    return ["id"] + [field for field in requested if field != "id"]
+
+def page_response(rows, next_cursor):
+    return ORJSONResponse({"items": rows, "next_cursor": next_cursor})
+
+async def row_or_404(db: AnySession, model, schema, row_id: int, fields: str | None, conditions=()):
+    row = await async_crud.get_row(db, model, selected_fields(schema, fields), row_id, conditions)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"{model.__name__} {row_id} not found")
+    return ORJSONResponse(row)
+
+def dump(schema, obj):
+    return schema.model_validate(obj).model_dump()
+
+def owner_of(user: Identity):
+    # Same owner as the HTML forms use, so a key is spent whichever way it arrives
+    return "admin" if user.role == "admin" else f"staff:{user.id}"
+
+# -------------------- Staff --------------------
+
+def check_staff_role(staff: schemas.StaffMemberCreate):
+    if staff.role not in schemas.STAFF_ROLES:
+        raise HTTPException(status_code=400, detail=f"Invalid role: {staff.role}")
+
+@router.get("/staff", response_model=schemas.StaffPage)
+async def list_staff(
+    after: int | None = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    role: str | None = None,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    conditions = [StaffMember.role == role] if role else []
+    return page_response(*await async_crud.get_rows_page(
+        db, StaffMember, selected_fields(schemas.StaffMemberOut, fields), conditions, after, limit
+    ))
+
+@router.get("/staff/{staff_id}", response_model=schemas.StaffMemberOut)
+async def get_staff(
+    staff_id: int,
+    fields: str | None = None,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    return await row_or_404(db, StaffMember, schemas.StaffMemberOut, staff_id, fields)
+
+@router.post("/staff", response_model=schemas.StaffMemberOut, status_code=201)
+async def create_staff(
+    staff: schemas.StaffMemberCreate,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_db)
+):
+    check_staff_role(staff)
+    try:
+        created = await async_crud.create_staff_member(db, staff)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail=f"Username already exists: {staff.username}")
+    return ORJSONResponse(dump(schemas.StaffMemberOut, created), status_code=201)
+
+@router.put("/staff/{staff_id}", response_model=schemas.StaffMemberOut)
+async def update_staff(
+    staff_id: int,
+    staff: schemas.StaffMemberCreate,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_db)
+):
+    # A blank password keeps the current one, as on the edit form
+    check_staff_role(staff)
+    try:
+        updated = await async_crud.update_staff_member(db, staff_id, staff)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail=f"Username already exists: {staff.username}")
+    if updated is None:
+        raise HTTPException(status_code=404, detail=f"StaffMember {staff_id} not found")
+    return ORJSONResponse(dump(schemas.StaffMemberOut, updated))
+
+@router.delete("/staff/{staff_id}", status_code=204)
+async def delete_staff(
+    staff_id: int,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_db)
+):
+    if not await async_crud.delete_staff_member(db, staff_id):
+        raise HTTPException(status_code=404, detail=f"StaffMember {staff_id} not found")
+    return Response(status_code=204)
+
+# -------------------- Students --------------------
+
+@router.get("/students", response_model=schemas.StudentPage)
+async def list_students(
+    after: int | None = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    return page_response(*await async_crud.get_rows_page(
+        db, Student, selected_fields(schemas.StudentOut, fields), (), after, limit
+    ))
+
+@router.get("/students/{student_id}", response_model=schemas.StudentOut)
+async def get_student(
+    student_id: int,
+    fields: str | None = None,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    return await row_or_404(db, Student, schemas.StudentOut, student_id, fields)
+
+@router.post("/students", response_model=schemas.StudentOut, status_code=201)
+async def create_student(
+    student: schemas.StudentCreate,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_db)
+):
+    try:
+        created = await async_crud.create_student(db, student)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail=f"Username already exists: {student.username}")
+    return ORJSONResponse(dump(schemas.StudentOut, created), status_code=201)
+
+@router.put("/students/{student_id}", response_model=schemas.StudentOut)
+async def update_student(
+    student_id: int,
+    student: schemas.StudentCreate,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_db)
+):
+    try:
+        updated = await async_crud.update_student(db, student_id, student)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail=f"Username already exists: {student.username}")
+    if updated is None:
+        raise HTTPException(status_code=404, detail=f"Student {student_id} not found")
+    return ORJSONResponse(dump(schemas.StudentOut, updated))
+
+@router.delete("/students/{student_id}", status_code=204)
+async def delete_student(
+    student_id: int,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_db)
+):
+    if not await async_crud.delete_student(db, student_id):
+        raise HTTPException(status_code=404, detail=f"Student {student_id} not found")
+    return Response(status_code=204)
+
+# -------------------- Incidents --------------------
+
+def incident_scope(user: Identity):
+    # Committee members only see the incidents assigned to them
+    return [DisciplineIncident.committee_member_id == user.id] if user.role == "committee" else []
+
+@router.get("/incidents", response_model=schemas.IncidentPage)
+async def list_incidents(
+    after: int | None = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    department: str | None = None,
+    class_name: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    committee_member_id: int | None = None,
+    student_id: str | None = None,
+    user: Identity = Depends(require_role("principal", "committee", "admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    conditions = incident_conditions(
+        department, class_name, date_from, date_to, committee_member_id, student_id
+    ) + incident_scope(user)
+    return page_response(*await async_crud.get_rows_page(
+        db, DisciplineIncident, selected_fields(schemas.IncidentOut, fields), conditions, after, limit
+    ))
+
+@router.get("/incidents/{incident_id}", response_model=schemas.IncidentOut)
+async def get_incident(
+    incident_id: int,
+    fields: str | None = None,
+    user: Identity = Depends(require_role("principal", "committee", "admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    return await row_or_404(db, DisciplineIncident, schemas.IncidentOut, incident_id, fields, incident_scope(user))
+
+@router.post("/incidents", response_model=schemas.IncidentOut, status_code=201)
+async def create_incident(
+    incident: schemas.IncidentCreate,
+    idempotency_key: str | None = Header(None),
+    user: Identity = Depends(require_role("faculty", "admin")),
+    db: AnySession = Depends(get_db)
+):
+    if incident.committee_member_id:
+        staff_directory = await async_crud.get_staff_directory(db)
+        committee_member = staff_directory.member(incident.committee_member_id)
+        if not committee_member or committee_member.role != "committee":
+            raise HTTPException(status_code=400, detail=f"Invalid committee member ID: {incident.committee_member_id}")
+    try:
+        created = await async_crud.create_incident(db, incident, idempotency_key, owner_of(user))
+    except idempotency.DuplicateRequest:
+        raise HTTPException(status_code=409, detail="Idempotency-Key already used for an applied request")
+    return ORJSONResponse(dump(schemas.IncidentOut, created), status_code=201)
+
+# -------------------- Disciplinary actions --------------------
+
+def action_scope(user: Identity):
+    if user.role != "committee":
+        return []
+    return [DisciplinaryAction.incident_id.in_(
+        select(DisciplineIncident.id).where(DisciplineIncident.committee_member_id == user.id)
+    )]
+
+@router.get("/actions", response_model=schemas.ActionPage)
+async def list_actions(
+    after: int | None = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    student_id: str | None = None,
+    incident_id: int | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    user: Identity = Depends(require_role("principal", "committee", "admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    conditions = action_conditions(student_id, incident_id, date_from, date_to) + action_scope(user)
+    return page_response(*await async_crud.get_rows_page(
+        db, DisciplinaryAction, selected_fields(schemas.DisciplinaryActionOut, fields), conditions, after, limit
+    ))
+
+@router.get("/actions/{action_id}", response_model=schemas.DisciplinaryActionOut)
+async def get_action(
+    action_id: int,
+    fields: str | None = None,
+    user: Identity = Depends(require_role("principal", "committee", "admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    return await row_or_404(
+        db, DisciplinaryAction, schemas.DisciplinaryActionOut, action_id, fields, action_scope(user)
+    )
+
+@router.post("/actions", response_model=schemas.DisciplinaryActionOut, status_code=201)
+async def create_action(
+    action: schemas.DisciplinaryActionCreate,
+    idempotency_key: str | None = Header(None),
+    user: Identity = Depends(require_role("committee", "admin")),
+    db: AnySession = Depends(get_db)
+):
+    # Committee members may only act on the incidents assigned to them
+    incident = await async_crud.get_row(
+        db, DisciplineIncident, ["id", "committee_member_id"], action.incident_id
+    )
+    if incident is None:
+        raise HTTPException(status_code=404, detail=f"DisciplineIncident {action.incident_id} not found")
+    if user.role == "committee" and incident["committee_member_id"] != user.id:
+        raise HTTPException(status_code=403, detail=f"Incident {action.incident_id} is not assigned to you")
+    try:
+        created = await async_crud.create_disciplinary_action(db, action, idempotency_key, owner_of(user))
+    except idempotency.DuplicateRequest:
+        raise HTTPException(status_code=409, detail="Idempotency-Key already used for an applied request")
+    return ORJSONResponse(dump(schemas.DisciplinaryActionOut, created), status_code=201)
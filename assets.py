@@ -0,0 +1,144 @@
+"""Build the static asset bundles: content-hashed, precompressed copies of the
+stylesheets and scripts under static/css and static/js.
+
+    python assets.py
+
+Writes static/dist/<name>.<hash>.<ext> with .gz (and .br when the brotli
+package is installed) siblings, plus the manifest templates resolve
+asset_url() through. Without a build, pages link the source files directly.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import stat
+from mimetypes import guess_type
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = "static"
+DIST_DIR = "dist"
+SOURCE_DIRS = ("css", "js")
+MANIFEST = "manifest.json"
+
+# Bundle names change with their content, so browsers may keep them forever
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# -------------------- Templates --------------------
+
+_manifest = None
+
+def load_manifest(static_dir: str = STATIC_DIR):
+    global _manifest
+    try:
+        with open(os.path.join(static_dir, DIST_DIR, MANIFEST)) as manifest_file:
+            _manifest = json.load(manifest_file)
+    except FileNotFoundError:
+        _manifest = {}
+    return _manifest
+
+def asset_url(path: str):
+    # Jinja global: asset_url('css/home.css') -> /static/dist/home.<hash>.css
+    manifest = _manifest if _manifest is not None else load_manifest()
+    return f"/static/{manifest.get(path, path)}"
+
+# -------------------- Serving --------------------
+
+def accepted_encodings(scope):
+    accepted = set()
+    for part in Headers(scope=scope).get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+class AssetFiles(StaticFiles):
+    # StaticFiles that sends the precompressed sibling of a bundle when the
+    # client accepts it, and marks bundles immutable
+    async def get_response(self, path: str, scope):
+        if path.split(os.sep)[0] != DIST_DIR or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+        response = await self.precompressed_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+        response.headers["cache-control"] = IMMUTABLE
+        response.headers["vary"] = "Accept-Encoding"
+        return response
+
+    async def precompressed_response(self, path: str, scope):
+        accepted = accepted_encodings(scope)
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                response = FileResponse(
+                    full_path,
+                    stat_result=stat_result,
+                    media_type=guess_type(path)[0],
+                    headers={"content-encoding": encoding}
+                )
+                if self.is_not_modified(response.headers, Headers(scope=scope)):
+                    return NotModifiedResponse(response.headers)
+                return response
+        return None
+
+# -------------------- Build --------------------
+
+def write_file(path: str, content: bytes):
+    with open(path, "wb") as output:
+        output.write(content)
+
+def build(static_dir: str = STATIC_DIR):
+    out_dir = os.path.join(static_dir, DIST_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {}
+    outputs = {MANIFEST}
+    for kind in SOURCE_DIRS:
+        source_dir = os.path.join(static_dir, kind)
+        if not os.path.isdir(source_dir):
+            continue
+        for name in sorted(os.listdir(source_dir)):
+            with open(os.path.join(source_dir, name), "rb") as source:
+                content = source.read()
+            stem, ext = os.path.splitext(name)
+            bundle = f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+            write_file(os.path.join(out_dir, bundle), content)
+            # mtime=0 keeps the .gz byte-identical across builds
+            write_file(os.path.join(out_dir, bundle + ".gz"), gzip.compress(content, 9, mtime=0))
+            outputs.update((bundle, bundle + ".gz"))
+            if brotli is not None:
+                write_file(os.path.join(out_dir, bundle + ".br"), brotli.compress(content, quality=11))
+                outputs.add(bundle + ".br")
+            manifest[f"{kind}/{name}"] = f"{DIST_DIR}/{bundle}"
+
+    # Bundles of earlier builds are no longer referenced by any page
+    for name in os.listdir(out_dir):
+        if name not in outputs:
+            os.remove(os.path.join(out_dir, name))
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    with open(manifest_path + ".tmp", "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return manifest
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build hashed, precompressed static bundles")
+    parser.add_argument("--static-dir", default=STATIC_DIR)
+    args = parser.parse_args()
+
+    manifest = build(args.static_dir)
+    print(f"Built {len(manifest)} bundles in {os.path.join(args.static_dir, DIST_DIR)}"
+          + ("" if brotli is not None else " (gzip only; install brotli for .br)"))
@@ -0,0 +1,143 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+import crud
+import dashboard_stats
+import search
+import settings
+import table_versions
+from passwords import hash_password
+from role_directory import directory
+from schemas import StaffMemberCreate, StudentCreate, IncidentCreate, DisciplinaryActionCreate
+
+# Awaitable versions of the crud.py functions. With an AsyncSession the sync
+# query code runs on the async driver through run_sync; with a plain Session
+# it runs in the threadpool, so a worker is held only for the DB call itself.
+
+# sqlalchemy.ext.asyncio (and its greenlet bridge) costs a noticeable share
+# of startup, so sync mode never imports it
+if settings.DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    AnySession = Session | AsyncSession
+else:
+    AnySession = Session
+
+async def call(db: AnySession, fn, *args, **kwargs):
+    if not isinstance(db, Session):
+        # AsyncSession
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+async def hashed(create_schema):
+    # Run the KDF in a worker thread so async mode does not block the event loop
+    if not create_schema.password:
+        return create_schema
+    password_hash = await run_in_threadpool(hash_password, create_schema.password)
+    return create_schema.model_copy(update={"password": password_hash})
+
+# -------------------- Account Functions --------------------
+
+async def get_accounts_by_username(db: AnySession, username: str):
+    return await call(db, crud.get_accounts_by_username, username)
+
+async def set_password_hash(db: AnySession, kind: str, account_id: int, password_hash: str):
+    return await call(db, crud.set_password_hash, kind, account_id, password_hash)
+
+# -------------------- Staff Functions --------------------
+
+async def create_staff_member(db: AnySession, staff: StaffMemberCreate):
+    return await call(db, crud.create_staff_member, await hashed(staff))
+
+async def get_staff_by_id(db: AnySession, staff_id: int):
+    return await call(db, crud.get_staff_by_id, staff_id)
+
+async def get_all_staff(db: AnySession):
+    return await call(db, crud.get_all_staff)
+
+async def get_staff_directory(db: AnySession):
+    # Staff grouped by role, loaded once and kept until a staff write
+    snapshot = directory.get()
+    if snapshot is None:
+        generation = directory.generation()
+        snapshot = directory.put(await call(db, crud.get_staff_directory), generation)
+    return snapshot
+
+async def get_table_versions(db: AnySession, *tables: str):
+    return await call(db, table_versions.current, *tables)
+
+async def update_staff_member(db: AnySession, staff_id: int, staff: StaffMemberCreate):
+    return await call(db, crud.update_staff_member, staff_id, await hashed(staff))
+
+async def delete_staff_member(db: AnySession, staff_id: int):
+    return await call(db, crud.delete_staff_member, staff_id)
+
+# -------------------- Student Functions --------------------
+
+async def create_student(db: AnySession, student: StudentCreate):
+    return await call(db, crud.create_student, await hashed(student))
+
+async def get_student_by_id(db: AnySession, student_id: int):
+    return await call(db, crud.get_student_by_id, student_id)
+
+async def get_all_students(db: AnySession):
+    return await call(db, crud.get_all_students)
+
+async def update_student(db: AnySession, student_id: int, student: StudentCreate):
+    return await call(db, crud.update_student, student_id, await hashed(student))
+
+async def delete_student(db: AnySession, student_id: int):
+    return await call(db, crud.delete_student, student_id)
+
+# -------------------- Incident Functions --------------------
+
+async def create_incident(db: AnySession, incident: IncidentCreate, idempotency_key: str | None = None, owner: str | None = None):
+    return await call(db, crud.create_incident, incident, idempotency_key, owner)
+
+async def get_incidents_page(db: AnySession, **filters):
+    return await call(db, crud.get_incidents_page, **filters)
+
+async def get_incidents_by_student_id(db: AnySession, student_id: str):
+    return await call(db, crud.get_incidents_by_student_id, student_id)
+
+async def get_incidents_by_committee_member(db: AnySession, committee_member_id: int):
+    return await call(db, crud.get_incidents_by_committee_member, committee_member_id)
+
+# -------------------- Disciplinary Action Functions --------------------
+
+async def create_disciplinary_action(
+    db: AnySession, action: DisciplinaryActionCreate, idempotency_key: str | None = None, owner: str | None = None
+):
+    return await call(db, crud.create_disciplinary_action, action, idempotency_key, owner)
+
+async def create_disciplinary_actions(
+    db: AnySession, actions: list[DisciplinaryActionCreate], idempotency_key: str | None = None, owner: str | None = None
+):
+    return await call(db, crud.create_disciplinary_actions, actions, idempotency_key, owner)
+
+async def get_actions_by_student_id(db: AnySession, student_id: str):
+    return await call(db, crud.get_actions_by_student_id, student_id)
+
+async def get_all_actions(db: AnySession):
+    return await call(db, crud.get_all_actions)
+
+# -------------------- Statistics --------------------
+
+async def get_statistics(db: AnySession):
+    return await call(db, dashboard_stats.get_statistics)
+
+async def get_committee_statistics(db: AnySession, committee_member_id: int):
+    return await call(db, dashboard_stats.get_committee_statistics, committee_member_id)
+
+# -------------------- Search --------------------
+
+async def search_descriptions(db: AnySession, q: str, **options):
+    return await call(db, search.search, q, **options)
+
+# -------------------- API Functions --------------------
+
+async def get_rows_page(db: AnySession, model, fields, conditions=(), after_id: int | None = None, limit: int = 50):
+    return await call(db, crud.get_rows_page, model, fields, conditions, after_id, limit)
+
+async def get_row(db: AnySession, model, fields, row_id: int, conditions=()):
+    return await call(db, crud.get_row, model, fields, row_id, conditions)
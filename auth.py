@@ -0,0 +1,107 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+
+from fastapi import Request
+
+import settings
+from identity import Identity, account_kind, generations
+
+logger = logging.getLogger(__name__)
+
+SESSION_COOKIE = "session"
+
+if settings.SESSION_SECRET:
+    _secret = settings.SESSION_SECRET.encode()
+else:
+    # Tokens signed with a per-process key only validate in this process
+    logger.warning("SESSION_SECRET is not set; sessions will not survive restarts or span workers")
+    _secret = secrets.token_bytes(32)
+
+class AuthError(Exception):
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        self.message = message
+
+def _b64encode(data: bytes):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def _b64decode(data: str):
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def _sign(payload: str):
+    return _b64encode(hmac.new(_secret, payload.encode(), hashlib.sha256).digest())
+
+# -------------------- Tokens --------------------
+
+def issue_token(identity: Identity, ttl: int | None = None):
+    # Token is <base64 JSON payload>.<base64 HMAC-SHA256 of the payload>.
+    # It carries the role and name, so authorizing a request needs no DB lookup,
+    # and the account's generation: updating or deleting the account revokes it.
+    expires_at = int(time.time()) + (ttl or settings.SESSION_TTL)
+    generation = generations.get(account_kind(identity), identity.id)
+    payload = _b64encode(json.dumps(
+        {"id": identity.id, "name": identity.name, "role": identity.role, "gen": generation, "exp": expires_at},
+        separators=(",", ":")
+    ).encode())
+    return f"{payload}.{_sign(payload)}"
+
+def read_token(token: str | None):
+    if not token or "." not in token:
+        return None
+    payload, signature = token.rsplit(".", 1)
+    try:
+        # compare_digest only takes ASCII str, so compare bytes; a cookie
+        # with characters that do not encode is just an invalid session
+        if not hmac.compare_digest(signature.encode(), _sign(payload).encode()):
+            return None
+    except UnicodeEncodeError:
+        return None
+    try:
+        data = json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+    if data.get("exp", 0) < time.time():
+        return None
+    identity = Identity(id=data["id"], name=data["name"], role=data["role"])
+    if data.get("gen", 0) < generations.get(account_kind(identity), identity.id):
+        return None
+    return identity
+
+def set_session_cookie(response, identity: Identity):
+    response.set_cookie(
+        SESSION_COOKIE,
+        issue_token(identity),
+        max_age=settings.SESSION_TTL,
+        httponly=True,
+        samesite="lax",
+        secure=settings.SESSION_COOKIE_SECURE
+    )
+    return response
+
+def clear_session_cookie(response):
+    response.delete_cookie(SESSION_COOKIE)
+    return response
+
+# -------------------- Dependencies --------------------
+
+def current_user(request: Request):
+    return read_token(request.cookies.get(SESSION_COOKIE))
+
+def require_role(*roles: str):
+    def dependency(request: Request):
+        user = current_user(request)
+        if user is None:
+            logger.error("No session for %s", request.url.path)
+            # JSON clients get the standard 401; pages keep their 400
+            status_code = 401 if request.url.path.startswith("/api/") else 400
+            raise AuthError(status_code, "User ID is required. Please log in.")
+        if user.role not in roles:
+            logger.error("Unauthorized access to %s: ID %s, role %s", request.url.path, user.id, user.role)
+            raise AuthError(403, "Unauthorized access")
+        return user
+    return dependency
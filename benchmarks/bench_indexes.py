@@ -0,0 +1,83 @@
+"""Query plan and latency of the hot lookups before and after migration 2.
+
+    python -m benchmarks.bench_indexes --rows 1000000
+    python -m benchmarks.bench_indexes --url postgresql://... --rows 1000000
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import create_engine, select, text
+
+import migrations
+import models
+from benchmarks.seed import seed
+
+Incident = models.DisciplineIncident
+Action = models.DisciplinaryAction
+
+QUERIES = {
+    "incidents by committee member": select(Incident).where(Incident.committee_member_id == 3).order_by(Incident.id).limit(50),
+    "incidents by student": select(Incident).where(Incident.student_id == "42"),
+    "incidents by department/class": select(Incident).where(
+        Incident.department == "CSE", Incident.class_name == "II Year"
+    ).order_by(Incident.id).limit(50),
+    "actions by student": select(Action).where(Action.student_id == "42"),
+    "actions by incident": select(Action).where(Action.incident_id == 4242),
+}
+
+def explain(conn, statement):
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN ANALYZE "
+    return [" ".join(str(col) for col in row) for row in conn.execute(text(prefix + sql))]
+
+def time_query(conn, statement, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(statement).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def report(engine, label, repeat):
+    print(f"\n=== {label} ===")
+    results = {}
+    with engine.connect() as conn:
+        for name, statement in QUERIES.items():
+            results[name] = time_query(conn, statement, repeat)
+            print(f"{name:32s} {results[name]:9.2f} ms")
+            for line in explain(conn, statement):
+                print(f"    {line}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite:///./bench_indexes.db")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="incidents to seed (actions get half)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    models.Base.metadata.drop_all(bind=engine)
+    migrations.migration_metadata.drop_all(bind=engine)
+    migrations.upgrade(engine, target=1)
+
+    start = time.perf_counter()
+    seed(engine, students=args.rows // 20 or 1, staff=200, incidents=args.rows, actions=args.rows // 2)
+    print(f"Seeded {args.rows} incidents in {time.perf_counter() - start:.1f}s")
+
+    before = report(engine, "without indexes (schema version 1)", args.repeat)
+    start = time.perf_counter()
+    migrations.upgrade(engine)
+    print(f"\nMigration 2 built indexes in {time.perf_counter() - start:.1f}s")
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+    after = report(engine, "with indexes (latest schema)", args.repeat)
+
+    print("\n=== speedup ===")
+    for name in QUERIES:
+        print(f"{name:32s} {before[name] / max(after[name], 1e-6):9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Login throughput at different PBKDF2 work factors.
+
+    python -m benchmarks.bench_login --iterations 50000 100000 200000 600000
+"""
+import argparse
+import time
+
+import passwords
+
+def logins_per_second(iterations: int, seconds: float):
+    stored = passwords.hash_password("correct horse", iterations)
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        passwords.verify_password("correct horse", stored)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+def cached_logins_per_second(iterations: int, seconds: float):
+    # Repeated logins with the same credentials hit the verify cache
+    cache = passwords.VerifyCache(ttl=60, maxsize=1000, max_failures=10, failure_window=300)
+    stored = passwords.hash_password("correct horse", iterations)
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        cache.verify("correct horse", stored)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, nargs="+", default=[50000, 100000, 200000, 600000])
+    parser.add_argument("--seconds", type=float, default=2.0, help="time spent per setting")
+    args = parser.parse_args()
+
+    print(f"{'iterations':>10s} {'verify ms':>10s} {'logins/s/core':>14s} {'cached logins/s':>16s}")
+    for iterations in args.iterations:
+        rate = logins_per_second(iterations, args.seconds)
+        cached = cached_logins_per_second(iterations, args.seconds)
+        print(f"{iterations:>10d} {1000 / rate:>10.2f} {rate:>14.1f} {cached:>16.0f}")
+
+if __name__ == "__main__":
+    main()
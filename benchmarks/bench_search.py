@@ -0,0 +1,90 @@
+"""Full-text search latency on a large incident table.
+
+    python -m benchmarks.bench_search --incidents 1000000
+    python -m benchmarks.bench_search --url postgresql://localhost/bench --incidents 1000000
+"""
+import argparse
+import math
+import random
+import time
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+import migrations
+import models
+import search
+from benchmarks.seed import DEPARTMENTS, CLASSES, batched_insert
+
+VOCABULARY = (
+    "plagiarism cheating fighting bullying absence late phone vandalism smoking uniform "
+    "canteen library laboratory exam assignment hostel ragging disrespect noise theft "
+    "copying proxy attendance damage threat argument insult gate bus field"
+).split()
+FILLER = "student was found in during the class after before near with reported by staff".split()
+
+QUERIES = [
+    ("plagiarism", {}),
+    ("exam cheating", {}),
+    ("phone", {"department": "CSE"}),
+    ("hostel ragging", {"date_from": "2024-01-01"}),
+    ("vandal", {}),
+]
+
+def description(rng):
+    words = rng.sample(VOCABULARY, 2) + rng.choices(FILLER, k=8)
+    rng.shuffle(words)
+    return " ".join(words)
+
+def load(engine, incidents: int, batch_size: int = 20000, rng_seed: int = 42):
+    rng = random.Random(rng_seed)
+    with engine.begin() as conn:
+        batched_insert(conn, models.DisciplineIncident.__table__, (
+            {
+                "id": i,
+                "student_id": str(rng.randint(1, 5000)),
+                "student_name": "Student",
+                "class_name": rng.choice(CLASSES),
+                "department": rng.choice(DEPARTMENTS),
+                "committee_member_id": None,
+                "incident_date": f"20{rng.randint(20, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "description": description(rng),
+            }
+            for i in range(1, incidents + 1)
+        ), batch_size)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite:///./bench_search.db")
+    parser.add_argument("--incidents", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    migrations.upgrade(engine)
+    with Session(engine) as db:
+        existing = db.scalar(select(func.count()).select_from(models.DisciplineIncident))
+    if existing:
+        print(f"Using the {existing} incidents already in the database")
+    else:
+        start = time.perf_counter()
+        load(engine, args.incidents)
+        print(f"Loaded {args.incidents} incidents in {time.perf_counter() - start:.1f} s")
+
+    with Session(engine) as db:
+        print(f"backend: {search.backend(db)}")
+        print(f"{'query':32s} {'hits':>5s} {'p50 ms':>8s} {'p95 ms':>8s}")
+        for q, filters in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                hits = search.search(db, q, **filters)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            p50 = timings[math.ceil(0.50 * len(timings)) - 1] * 1000
+            p95 = timings[math.ceil(0.95 * len(timings)) - 1] * 1000
+            label = q + "".join(f" {key}={value}" for key, value in filters.items())
+            print(f"{label:32s} {len(hits):>5d} {p50:>8.1f} {p95:>8.1f}")
+
+if __name__ == "__main__":
+    main()
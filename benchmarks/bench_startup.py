@@ -0,0 +1,141 @@
+"""Cold-start time of the application module, measured with python -X importtime.
+
+Each run imports main (which builds the app) in a fresh interpreter against a
+scratch SQLite database, like a newly started worker. Reports the median
+import time, the largest contributors, and fails (exit status 1) when a
+module meant to load lazily was imported, or when the app's own share of the
+import is over budget. That share is main's import time minus the frameworks
+it loads (FRAMEWORKS), measured in the same run, so it tracks this code
+rather than the machine or the framework versions.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 10 --budget-percent 25 --top 15
+    APP_ROUTERS=common,api python -m benchmarks.bench_startup
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Third-party packages whose import time is not ours to budget
+FRAMEWORKS = ("fastapi", "starlette", "pydantic", "pydantic_core", "sqlalchemy", "jinja2", "anyio")
+
+# Imported on first use (or only in another mode), never at startup
+LAZY_MODULES = {
+    "sqlalchemy.ext.asyncio": "only DB_MODE=async needs it (async_crud.py)",
+    "sqlalchemy.dialects.postgresql": "dashboard_stats.upsert_for() loads only the dialect in use",
+    "migrations": "run by the lifespan or the gunicorn master",
+    "export": "imported by /export",
+    "bulk_import": "imported by /import (and starts a thread pool)",
+    "sql_profiler": "only with SQL_PROFILE",
+}
+
+def parse_importtime(stderr: str):
+    # "import time: self [us] | cumulative | <indent>package", two spaces per level
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), depth, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return modules
+
+def run_import(env):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"import main failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+def is_framework(name: str):
+    return name.split(".")[0] in FRAMEWORKS
+
+def children_of_main(modules):
+    # Modules are logged as they finish, so main's imports precede it. Walking
+    # back from main visits each module before the ones it imported.
+    index = next(i for i, module in enumerate(modules) if module[0] == "main")
+    depth = modules[index][1]
+    children = []
+    framework_ms = 0.0
+    inside = []  # (depth, within a framework's import) for the current branch
+    for name, module_depth, _, cumulative in reversed(modules[:index]):
+        if module_depth <= depth:
+            break
+        if module_depth == depth + 1:
+            children.append((name, cumulative))
+        while inside and inside[-1][0] >= module_depth:
+            inside.pop()
+        nested = bool(inside) and inside[-1][1]
+        if is_framework(name) and not nested:
+            framework_ms += cumulative
+        inside.append((module_depth, nested or is_framework(name)))
+    return modules[index], children, framework_ms
+
+def exempt(name: str):
+    # Modules that are expected at startup in the configuration being measured
+    if name == "sqlalchemy.ext.asyncio":
+        return os.environ.get("DB_MODE") == "async"
+    if name.startswith("sqlalchemy.dialects."):
+        return os.environ.get("DATABASE_URL", "sqlite").startswith(name.rsplit(".", 1)[1])
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    # Share of main's import spent outside FRAMEWORKS: this code, the standard
+    # library modules it pulls in and the work of building the app. The full
+    # app's median was 22% when this was set. It catches slow imports in our
+    # own modules; the modules deferred to first use are checked by name
+    # (LAZY_MODULES), since most of what they save is framework time.
+    parser.add_argument("--budget-percent", type=float, default=30)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.getcwd(),
+        DATABASE_URL=os.environ.get("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/startup.db"),
+    )
+    run_import(env)  # write the .pyc files, so every measured run starts alike
+
+    totals = []
+    own = []
+    shares = []
+    contributions = {}
+    for _ in range(args.runs):
+        modules = run_import(env)
+        (_, _, main_self, main_total), children, framework_ms = children_of_main(modules)
+        totals.append(main_total)
+        # main's own time is mostly building the app: middleware and routes
+        own.append(main_self)
+        shares.append(100 * (main_total - framework_ms) / main_total)
+        for name, cumulative in children:
+            contributions.setdefault(name, []).append(cumulative)
+    loaded = {module[0] for module in modules}
+
+    total = statistics.median(totals)
+    share = statistics.median(shares)
+    print(f"import main: median {total:.0f} ms over {args.runs} runs (min {min(totals):.0f}, max {max(totals):.0f})")
+    print(f"app's own share: median {share:.1f}% (outside {', '.join(FRAMEWORKS)}), "
+          f"budget {args.budget_percent:.0f}%")
+    print(f"  {'main (app and routes)':32s} {statistics.median(own):8.1f} ms")
+    ranked = sorted(contributions.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, samples in ranked[:args.top]:
+        print(f"  {name:32s} {statistics.median(samples):8.1f} ms")
+
+    failed = share > args.budget_percent
+    if failed:
+        print(f"OVER BUDGET by {share - args.budget_percent:.1f} points")
+    for name, reason in LAZY_MODULES.items():
+        if name in loaded and not exempt(name):
+            print(f"EAGER IMPORT: {name} was imported at startup; {reason}")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
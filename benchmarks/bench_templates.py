@@ -0,0 +1,64 @@
+"""Template compile cost for a cold worker, with and without the bytecode cache.
+
+Each measurement runs in a fresh interpreter, like a newly started worker.
+
+    python -m benchmarks.bench_templates --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+WORKER = """
+import json, time
+start = time.perf_counter()
+import settings
+from templating import make_templates, warm_up
+templates = make_templates("templates")
+setup = time.perf_counter()
+if {warm}:
+    warm_up(templates)
+warmed = time.perf_counter()
+templates.get_template("committeedashboard.html").render({{
+    "request": None,
+    "staff": {{"id": 1, "name": "x"}},
+    "stats": {{"incidents": 12, "open": 4, "actioned": 8, "actions": 9}},
+}})
+first = time.perf_counter()
+print(json.dumps({{"warmup_ms": (warmed - setup) * 1000, "first_render_ms": (first - warmed) * 1000}}))
+"""
+
+def run_worker(env, warm: bool):
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER.format(warm=warm)],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def measure(label, env, warm, runs):
+    samples = [run_worker(env, warm) for _ in range(runs)]
+    warmup = statistics.median(sample["warmup_ms"] for sample in samples)
+    first = statistics.median(sample["first_render_ms"] for sample in samples)
+    print(f"{label:42s} warm-up {warmup:8.1f} ms   first render {first:7.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="jinja-bench-")
+    base = dict(os.environ, PYTHONPATH=os.getcwd(), TEMPLATE_BYTECODE_CACHE_DIR=cache_dir)
+    no_cache = dict(base, TEMPLATE_BYTECODE_CACHE="0")
+    with_cache = dict(base, TEMPLATE_BYTECODE_CACHE="1")
+
+    measure("no bytecode cache, no warm-up", no_cache, False, args.runs)
+    measure("no bytecode cache, warm-up", no_cache, True, args.runs)
+    run_worker(with_cache, True)  # populate the on-disk cache
+    measure("bytecode cache, no warm-up", with_cache, False, args.runs)
+    measure("bytecode cache, warm-up", with_cache, True, args.runs)
+
+if __name__ == "__main__":
+    main()
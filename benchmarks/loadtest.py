@@ -0,0 +1,186 @@
+"""Load test of the main user journeys, reporting latency percentiles and RPS per route.
+
+Runs in-process through the ASGI app by default (a scratch SQLite database is
+seeded first), or against a running server with --url:
+
+    python -m benchmarks.loadtest --users 20 --duration 30
+    python -m benchmarks.loadtest --url http://localhost:8000 --users 50 --duration 60
+    python -m benchmarks.loadtest --output run.json --baseline last_release.json
+
+The server in --url mode should be pointed at a database seeded with the
+same --students/--staff counts (python -m benchmarks.seed, or --seed here).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+import httpx
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, route: str, seconds: float, ok: bool):
+        self.latencies.setdefault(route, []).append(seconds)
+        if not ok:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+def percentile(ordered, fraction: float):
+    # Nearest-rank percentile of an already sorted list
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+def summarize(recorder: Recorder, elapsed: float):
+    results = {}
+    for route, samples in sorted(recorder.latencies.items()):
+        ordered = sorted(samples)
+        results[route] = {
+            "requests": len(ordered),
+            "errors": recorder.errors.get(route, 0),
+            "rps": len(ordered) / elapsed,
+            "p50_ms": percentile(ordered, 0.50) * 1000,
+            "p95_ms": percentile(ordered, 0.95) * 1000,
+            "p99_ms": percentile(ordered, 0.99) * 1000,
+        }
+    return results
+
+async def timed(client, recorder, route: str, method: str, path: str, expect=(200, 303), **kwargs):
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, path, **kwargs)
+        ok = response.status_code in expect
+    except httpx.HTTPError:
+        ok = False
+    recorder.record(route, time.perf_counter() - start, ok)
+
+# -------------------- Journeys --------------------
+
+async def student_journey(client, recorder, rng, population):
+    username = f"student{rng.randint(1, population.students)}"
+    await timed(client, recorder, "POST /login", "POST", "/login", data={"username": username, "password": username})
+    await timed(client, recorder, "GET /studentdashboard", "GET", "/studentdashboard")
+    await timed(client, recorder, "GET /sd_disciplineincidents", "GET", "/sd_disciplineincidents")
+    await timed(client, recorder, "GET /sd_viewdisciplineactions", "GET", "/sd_viewdisciplineactions")
+
+async def faculty_journey(client, recorder, rng, population):
+    # Seeded staff with even ids are faculty, odd ids from 3 are committee members
+    username = f"staff{2 * rng.randint(1, population.staff // 2)}"
+    await timed(client, recorder, "POST /login", "POST", "/login", data={"username": username, "password": username})
+    await timed(client, recorder, "GET /facultydashboard", "GET", "/facultydashboard")
+    await timed(client, recorder, "GET /fd_disciplineincidents", "GET", "/fd_disciplineincidents")
+    student = rng.randint(1, population.students)
+    await timed(client, recorder, "POST /fd_submit_incident", "POST", "/fd_submit_incident", data={
+        "student_id": str(student),
+        "student_name": f"Student {student}",
+        "class_name": "II Year",
+        "department": "CSE",
+        "committee_member_id": str(2 * rng.randint(1, (population.staff - 1) // 2) + 1),
+        "incident_date": "2025-01-15",
+        "description": "Load test incident",
+    })
+
+async def committee_journey(client, recorder, rng, population):
+    username = f"staff{2 * rng.randint(1, (population.staff - 1) // 2) + 1}"
+    await timed(client, recorder, "POST /login", "POST", "/login", data={"username": username, "password": username})
+    await timed(client, recorder, "GET /committeedashboard", "GET", "/committeedashboard")
+    await timed(client, recorder, "GET /cd_assignactions", "GET", "/cd_assignactions")
+    await timed(client, recorder, "GET /cd_disciplineactions", "GET", "/cd_disciplineactions")
+
+JOURNEYS = {
+    "student": student_journey,
+    "faculty": faculty_journey,
+    "committee": committee_journey,
+}
+
+async def virtual_user(make_client, recorder, rng, population, journeys, deadline: float):
+    # Each virtual user keeps its own cookie jar, like a browser
+    async with make_client() as client:
+        while time.perf_counter() < deadline:
+            await JOURNEYS[rng.choice(journeys)](client, recorder, rng, population)
+
+async def run(make_client, population, users: int, duration: float, journeys, rng_seed: int):
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        virtual_user(make_client, recorder, random.Random(rng_seed + i), population, journeys, deadline)
+        for i in range(users)
+    ))
+    return summarize(recorder, time.perf_counter() - start)
+
+# -------------------- Reporting --------------------
+
+def print_report(results):
+    print(f"{'route':32s} {'requests':>9s} {'errors':>7s} {'rps':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+    for route, row in results.items():
+        print(
+            f"{route:32s} {row['requests']:>9d} {row['errors']:>7d} {row['rps']:>8.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+        )
+
+def compare(results, baseline, tolerance: float):
+    # A route regresses when its p95 exceeds the baseline p95 by more than tolerance
+    regressions = []
+    for route, row in results.items():
+        previous = baseline.get(route)
+        if previous and row["p95_ms"] > previous["p95_ms"] * tolerance:
+            regressions.append(f"{route}: p95 {previous['p95_ms']:.1f} ms -> {row['p95_ms']:.1f} ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running server; in-process when omitted")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--journeys", nargs="+", choices=sorted(JOURNEYS), default=sorted(JOURNEYS))
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--staff", type=int, default=50)
+    parser.add_argument("--incidents", type=int, default=10000)
+    parser.add_argument("--actions", type=int, default=5000)
+    parser.add_argument("--seed", action="store_true", help="seed DATABASE_URL first (always done in-process)")
+    parser.add_argument("--rng-seed", type=int, default=42)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier run; exit 1 on p95 regressions")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args()
+
+    in_process = args.url is None
+    if in_process:
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/loadtest.db")
+    if args.seed or in_process:
+        import database
+        import migrations
+        from benchmarks.seed import seed
+
+        migrations.upgrade(database.engine)
+        seed(database.engine, args.students, args.staff, args.incidents, args.actions)
+
+    if in_process:
+        import main as app_module
+
+        transport = httpx.ASGITransport(app=app_module.app)
+        make_client = lambda: httpx.AsyncClient(transport=transport, base_url="http://loadtest")
+    else:
+        make_client = lambda: httpx.AsyncClient(base_url=args.url, timeout=30)
+
+    results = asyncio.run(run(make_client, args, args.users, args.duration, args.journeys, args.rng_seed))
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(results, json.load(baseline), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Check that list pages run a constant number of SQL statements.
+
+Renders each page against a small and a large seeded database and fails
+(exit status 1) if the statement count grows with the number of rows.
+
+    python -m benchmarks.query_counts
+"""
+import os
+import sys
+import tempfile
+
+# Point the app at a scratch SQLite database before it is imported
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/query_counts.db")
+
+from sqlalchemy import event
+
+import database
+import migrations
+import models
+from benchmarks.seed import seed
+
+PAGES = {
+    "committee": ["/cd_disciplineactions", "/committeedashboard"],
+    "principal": ["/pd_disciplineactions", "/principaldashboard"],
+    "admin": ["/disciplineincidents"],
+}
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self.on_execute)
+
+    def on_execute(self, *args):
+        self.count += 1
+
+def reset_database(rows: int):
+    models.Base.metadata.drop_all(bind=database.engine)
+    migrations.migration_metadata.drop_all(bind=database.engine)
+    migrations.upgrade(database.engine)
+    seed(database.engine, students=50, staff=10, incidents=rows, actions=rows)
+
+def count_statements(client, counter, credentials, path):
+    client.post("/login", data={"username": credentials, "password": credentials})
+    counter.count = 0
+    response = client.get(path)
+    response.raise_for_status()
+    return counter.count
+
+def main():
+    from fastapi.testclient import TestClient
+
+    import main as app_module
+
+    client = TestClient(app_module.app)
+    counter = StatementCounter(database.read_engine)
+    # Seeded staff: staff1 is the principal, odd ids from 3 are committee members
+    logins = {"committee": "staff3", "principal": "staff1", "admin": "admin"}
+    counts = {}
+    for rows in (10, 200):
+        reset_database(rows)
+        for role, paths in PAGES.items():
+            for path in paths:
+                counts.setdefault(path, []).append(count_statements(client, counter, logins[role], path))
+
+    failed = False
+    for path, (small, large) in counts.items():
+        status = "ok" if small == large else "GROWS WITH ROWS"
+        failed = failed or small != large
+        print(f"{path:28s} 10 rows: {small:3d} statements   200 rows: {large:3d} statements   {status}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import random
+
+from sqlalchemy import create_engine, inspect, text
+
+import dashboard_stats
+import models
+import table_versions
+
+DEPARTMENTS = ["CSE", "ECE", "MECH", "CIVIL", "EEE", "IT"]
+CLASSES = ["I Year", "II Year", "III Year", "IV Year"]
+ROLES = ["principal", "faculty", "committee"]
+
+def batched_insert(conn, table, rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            conn.execute(table.insert(), batch)
+            batch = []
+    if batch:
+        conn.execute(table.insert(), batch)
+
+def seed(engine, students=1000, staff=50, incidents=10000, actions=5000, batch_size=10000, rng_seed=42):
+    # Deterministic data so runs on different machines are comparable
+    rng = random.Random(rng_seed)
+    with engine.begin() as conn:
+        batched_insert(conn, models.StaffMember.__table__, (
+            {
+                "id": i,
+                "name": f"Staff {i}",
+                "username": f"staff{i}",
+                "password": f"staff{i}",
+                "role": "principal" if i == 1 else ROLES[1 + i % 2],
+            }
+            for i in range(1, staff + 1)
+        ), batch_size)
+        batched_insert(conn, models.Student.__table__, (
+            {"id": i, "name": f"Student {i}", "username": f"student{i}", "password": f"student{i}"}
+            for i in range(1, students + 1)
+        ), batch_size)
+        committee_ids = [i for i in range(2, staff + 1) if i % 2 == 1] or [None]
+        batched_insert(conn, models.DisciplineIncident.__table__, (
+            {
+                "id": i,
+                "student_id": str(rng.randint(1, students)),
+                "student_name": "Student",
+                "class_name": rng.choice(CLASSES),
+                "department": rng.choice(DEPARTMENTS),
+                "committee_member_id": rng.choice(committee_ids),
+                "incident_date": f"20{rng.randint(20, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "description": f"Incident {i} reported in class",
+            }
+            for i in range(1, incidents + 1)
+        ), batch_size)
+        batched_insert(conn, models.DisciplinaryAction.__table__, (
+            {
+                "id": i,
+                "incident_id": rng.randint(1, incidents),
+                "student_id": str(rng.randint(1, students)),
+                "action_description": f"Action {i}",
+                "assigned_date": f"20{rng.randint(20, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            }
+            for i in range(1, actions + 1)
+        ), batch_size)
+        # Explicit ids do not advance Postgres' serial sequences; move each
+        # past the seeded rows so the app's own inserts get fresh ids
+        if conn.dialect.name == "postgresql":
+            for model in (models.StaffMember, models.Student, models.DisciplineIncident, models.DisciplinaryAction):
+                table = model.__tablename__
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"coalesce(max(id), 1), max(id) IS NOT NULL) FROM {table}"
+                ))
+        # The rows above bypass crud, so the summary tables are recomputed
+        # and the list pages' cached copies invalidated. A database seeded at
+        # an older schema version (bench_indexes) may not have those tables
+        # yet; the migrations that create them fill them in.
+        tables = set(inspect(conn).get_table_names())
+        if models.IncidentStat.__tablename__ in tables:
+            dashboard_stats.rebuild(conn)
+        if models.TableVersion.__tablename__ in tables:
+            table_versions.bump(conn, *table_versions.VERSIONED)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed a database with synthetic students, staff, incidents and actions")
+    parser.add_argument("--url", default="sqlite:///./bench.db")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--staff", type=int, default=50)
+    parser.add_argument("--incidents", type=int, default=10000)
+    parser.add_argument("--actions", type=int, default=5000)
+    args = parser.parse_args()
+
+    import migrations
+    engine = create_engine(args.url)
+    migrations.upgrade(engine)
+    seed(engine, args.students, args.staff, args.incidents, args.actions)
+    print(f"Seeded {args.students} students, {args.staff} staff, {args.incidents} incidents, {args.actions} actions")
@@ -0,0 +1,168 @@
+"""Bulk import of students and staff members from CSV or JSONL.
+
+    python bulk_import.py students students.csv --batch-size 2000
+    python bulk_import.py staff staff.jsonl
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import settings
+import table_versions
+from models import StaffMember, Student
+from passwords import hash_password, is_hashed
+from role_directory import directory
+from schemas import STAFF_ROLES, StaffMemberCreate, StudentCreate
+
+logger = logging.getLogger(__name__)
+
+KINDS = {
+    "students": (Student, StudentCreate),
+    "staff": (StaffMember, StaffMemberCreate),
+}
+
+# pbkdf2_hmac releases the GIL, so hashing a batch scales across threads
+_hash_pool = ThreadPoolExecutor(max_workers=settings.IMPORT_HASH_THREADS)
+
+class ImportReport:
+    def __init__(self):
+        self.inserted = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self):
+        return {"inserted": self.inserted, "error_count": self.error_count, "errors": self.errors}
+
+def detect_format(filename: str | None):
+    return "jsonl" if filename and filename.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+def iter_records(lines, fmt: str):
+    # Yields (line number, dict or error message) without reading the whole file
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as e:
+            yield line_no, f"Invalid JSON: {e}"
+
+def _insert_batch(db: Session, model, batch, report: ImportReport, hash_iterations: int):
+    usernames = [row["username"] for _, row in batch]
+    taken = set(db.scalars(select(model.username).where(model.username.in_(usernames))))
+    pending = []
+    for line_no, row in batch:
+        if row["username"] in taken:
+            report.add_error(line_no, f"Username already exists: {row['username']}")
+        else:
+            pending.append((line_no, row))
+    if not pending:
+        return
+
+    hashes = _hash_pool.map(
+        lambda row: row["password"] if is_hashed(row["password"]) else hash_password(row["password"], hash_iterations),
+        [row for _, row in pending]
+    )
+    for (_, row), password_hash in zip(pending, hashes):
+        row["password"] = password_hash
+
+    try:
+        # One multi-row INSERT per batch (executemany / insertmanyvalues)
+        db.execute(insert(model), [row for _, row in pending])
+        table_versions.bump(db, model.__tablename__)
+        db.commit()
+        report.inserted += len(pending)
+    except IntegrityError:
+        # Lost a race with another writer: retry row by row to pin down the culprits
+        db.rollback()
+        for line_no, row in pending:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(model), row)
+                report.inserted += 1
+            except IntegrityError as e:
+                report.add_error(line_no, f"Database error: {e.orig}")
+        table_versions.bump(db, model.__tablename__)
+        db.commit()
+
+def import_accounts(db: Session, kind: str, lines, fmt: str = "csv", batch_size: int | None = None, hash_iterations: int | None = None):
+    # Imported passwords are hashed with a cheaper work factor; login rehashes
+    # them to PASSWORD_HASH_ITERATIONS the first time each account signs in.
+    model, schema = KINDS[kind]
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    hash_iterations = hash_iterations or settings.IMPORT_PASSWORD_HASH_ITERATIONS
+    report = ImportReport()
+    seen = set()
+    batch = []
+    for line_no, record in iter_records(lines, fmt):
+        if isinstance(record, str):
+            report.add_error(line_no, record)
+            continue
+        try:
+            row = schema(**record).model_dump()
+        except (ValidationError, TypeError) as e:
+            report.add_error(line_no, str(e).replace("\n", " "))
+            continue
+        blank = [field for field, value in row.items() if not value.strip()]
+        if blank:
+            report.add_error(line_no, f"Missing value for: {', '.join(blank)}")
+            continue
+        if kind == "staff" and row["role"] not in STAFF_ROLES:
+            report.add_error(line_no, f"Invalid role: {row['role']}")
+            continue
+        if row["username"] in seen:
+            report.add_error(line_no, f"Duplicate username in file: {row['username']}")
+            continue
+        seen.add(row["username"])
+        batch.append((line_no, row))
+        if len(batch) >= batch_size:
+            _insert_batch(db, model, batch, report, hash_iterations)
+            batch = []
+    if batch:
+        _insert_batch(db, model, batch, report, hash_iterations)
+    if kind == "staff" and report.inserted:
+        directory.invalidate()
+    logger.info("Imported %s %s (%s errors)", report.inserted, kind, report.error_count)
+    return report
+
+def import_file(db: Session, kind: str, binary_file, filename: str | None = None, batch_size: int | None = None):
+    lines = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+    try:
+        return import_accounts(db, kind, lines, detect_format(filename), batch_size)
+    finally:
+        lines.detach()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import students or staff members")
+    parser.add_argument("kind", choices=sorted(KINDS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--hash-iterations", type=int, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    from database import SessionLocal
+
+    with open(args.path, encoding="utf-8-sig", newline="") as source, SessionLocal() as db:
+        result = import_accounts(
+            db, args.kind, source, args.format or detect_format(args.path), args.batch_size, args.hash_iterations
+        )
+    print(json.dumps(result.as_dict(), indent=2))
@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import settings
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Key/value store behind the caches that several workers should agree on:
+# the role directory's generation, account generations (identity.py) and
+# login failure counts.
+# CACHE_URL=memory:// keeps everything in the process (one worker, or
+# staleness bounded by each cache's TTL); redis://... shares it between
+# workers and hosts, so an invalidation in one worker reaches all of them.
+# Values must be JSON-serializable.
+
+class LocalBackend:
+    # In-process stand-in: an LRU with per-key expiry
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _live(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] < now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, value, expires_at: float | None):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._live(key, time.monotonic())
+            return entry[0] if entry else None
+
+    def set(self, key: str, value, ttl: float | None = None):
+        with self._lock:
+            self._store(key, value, time.monotonic() + ttl if ttl is not None else None)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key: str, ttl: float | None = None):
+        # The expiry is set when the counter is created, like INCR + EXPIRE
+        now = time.monotonic()
+        with self._lock:
+            entry = self._live(key, now)
+            if entry is None:
+                entry = (0, now + ttl if ttl is not None else None)
+            value = entry[0] + 1
+            self._store(key, value, entry[1])
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def close(self):
+        pass
+
+class RedisBackend:
+    # redis-py resets its connection pool in a forked child, so one client
+    # created before a preloading server forks is safe in every worker
+    def __init__(self, url: str, prefix: str):
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str):
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value, ttl: float | None = None):
+        self._client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000) if ttl is not None else None)
+
+    def delete(self, key: str):
+        self._client.delete(self.prefix + key)
+
+    def incr(self, key: str, ttl: float | None = None):
+        value = self._client.incr(self.prefix + key)
+        if value == 1 and ttl is not None:
+            self._client.pexpire(self.prefix + key, int(ttl * 1000))
+        return value
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self.prefix + "*"):
+            self._client.delete(key)
+
+    def close(self):
+        self._client.close()
+
+def make_backend(url: str):
+    if url.startswith("memory://"):
+        return LocalBackend(settings.CACHE_MEMORY_SIZE)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        if redis is None:
+            raise RuntimeError(f"CACHE_URL={url} needs the redis package")
+        return RedisBackend(url, settings.CACHE_KEY_PREFIX)
+    raise ValueError(f"Unsupported CACHE_URL: {url}")
+
+cache = make_backend(settings.CACHE_URL)
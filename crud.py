@@ -1,6 +1,37 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, literal, select, union_all
+from sqlalchemy.orm import Session, joinedload, selectinload
 from models import StaffMember, Student, DisciplineIncident, DisciplinaryAction
 from schemas import StaffMemberCreate, StudentCreate, IncidentCreate, DisciplinaryActionCreate
+import dashboard_stats
+import idempotency
+import table_versions
+from identity import generations
+from role_directory import StaffEntry, directory
+from passwords import hash_password, is_hashed
+
+def stored_password(password: str):
+    # Callers on the event loop hash ahead of time in a worker thread
+    return password if is_hashed(password) else hash_password(password)
+
+# -------------------- Account Functions --------------------
+
+def get_accounts_by_username(db: Session, username: str):
+    # One round trip for both account tables; students first, as login always checked them first
+    students = select(
+        literal("student").label("kind"), Student.id, Student.name,
+        literal("student").label("role"), Student.password
+    ).where(Student.username == username)
+    staff = select(
+        literal("staff").label("kind"), StaffMember.id, StaffMember.name,
+        StaffMember.role, StaffMember.password
+    ).where(StaffMember.username == username)
+    rows = db.execute(union_all(students, staff)).all()
+    return sorted(rows, key=lambda row: row.kind != "student")
+
+def set_password_hash(db: Session, kind: str, account_id: int, password_hash: str):
+    model = StaffMember if kind == "staff" else Student
+    db.query(model).filter(model.id == account_id).update({model.password: password_hash})
+    db.commit()
 
 # -------------------- Staff Functions --------------------
 
@@ -8,42 +39,50 @@ def create_staff_member(db: Session, staff: StaffMemberCreate):
     db_staff = StaffMember(
         name=staff.name,
         username=staff.username,
-        password=staff.password,
+        password=stored_password(staff.password),
         role=staff.role
     )
     db.add(db_staff)
+    table_versions.bump(db, "staff_members")
     db.commit()
     db.refresh(db_staff)
+    directory.invalidate()
     return db_staff
 
-def get_staff_by_credentials(db: Session, username: str, password: str):
-    return db.query(StaffMember).filter(
-        StaffMember.username == username,
-        StaffMember.password == password
-    ).first()
-
 def get_staff_by_id(db: Session, staff_id: int):
     return db.query(StaffMember).filter(StaffMember.id == staff_id).first()
 
 def get_all_staff(db: Session):
     return db.query(StaffMember).all()
 
+def get_staff_directory(db: Session):
+    rows = db.execute(select(StaffMember.id, StaffMember.name, StaffMember.username, StaffMember.role))
+    return [StaffEntry(*row) for row in rows]
+
 def update_staff_member(db: Session, staff_id: int, staff: StaffMemberCreate):
     db_staff = db.query(StaffMember).filter(StaffMember.id == staff_id).first()
     if db_staff:
         db_staff.name = staff.name
         db_staff.username = staff.username
-        db_staff.password = staff.password
+        # A blank password on the edit form keeps the current one
+        if staff.password:
+            db_staff.password = stored_password(staff.password)
         db_staff.role = staff.role
+        table_versions.bump(db, "staff_members")
         db.commit()
         db.refresh(db_staff)
+        directory.invalidate()
+        generations.bump("staff", staff_id)
     return db_staff
 
 def delete_staff_member(db: Session, staff_id: int):
     db_staff = db.query(StaffMember).filter(StaffMember.id == staff_id).first()
     if db_staff:
         db.delete(db_staff)
+        table_versions.bump(db, "staff_members")
         db.commit()
+        directory.invalidate()
+        generations.bump("staff", staff_id)
         return True
     return False
 
@@ -53,19 +92,14 @@ def create_student(db: Session, student: StudentCreate):
     db_student = Student(
         name=student.name,
         username=student.username,
-        password=student.password
+        password=stored_password(student.password)
     )
     db.add(db_student)
+    table_versions.bump(db, "students")
     db.commit()
     db.refresh(db_student)
     return db_student
 
-def get_student_by_credentials(db: Session, username: str, password: str):
-    return db.query(Student).filter(
-        Student.username == username,
-        Student.password == password
-    ).first()
-
 def get_student_by_id(db: Session, student_id: int):
     return db.query(Student).filter(Student.id == student_id).first()
 
@@ -77,42 +111,100 @@ def update_student(db: Session, student_id: int, student: StudentCreate):
     if db_student:
         db_student.name = student.name
         db_student.username = student.username
-        db_student.password = student.password
+        if student.password:
+            db_student.password = stored_password(student.password)
+        table_versions.bump(db, "students")
         db.commit()
         db.refresh(db_student)
+        generations.bump("student", student_id)
     return db_student
 
 def delete_student(db: Session, student_id: int):
     db_student = db.query(Student).filter(Student.id == student_id).first()
     if db_student:
         db.delete(db_student)
+        table_versions.bump(db, "students")
         db.commit()
+        generations.bump("student", student_id)
         return True
     return False
 
 # -------------------- Incident Functions --------------------
 
-def create_incident(db: Session, incident: IncidentCreate):
+def create_incident(db: Session, incident: IncidentCreate, idempotency_key: str | None = None, owner: str | None = None):
     try:
-        db_incident = DisciplineIncident(
-            student_id=incident.student_id,
-            student_name=incident.student_name,
-            class_name=incident.class_name,
-            department=incident.department,
-            committee_member_id=incident.committee_member_id,
-            incident_date=incident.incident_date,
-            description=incident.description
-        )
-        db.add(db_incident)
+        if idempotency_key:
+            idempotency.claim(db, owner, idempotency_key)
+        # INSERT ... RETURNING hands back the new row, no refresh SELECT after commit
+        db_incident = db.scalars(
+            insert(DisciplineIncident).returning(DisciplineIncident), [incident.model_dump()]
+        ).one()
+        dashboard_stats.record_incident(db, db_incident)
+        # Detached, so the commit does not expire the values RETURNING gave us
+        db.expunge(db_incident)
         db.commit()
-        db.refresh(db_incident)
         return db_incident
+    except idempotency.DuplicateRequest:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise Exception(f"Database error: {str(e)}")
 
-def get_all_incidents(db: Session):
-    return db.query(DisciplineIncident).all()
+def incident_conditions(
+    department: str | None = None,
+    class_name: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    committee_member_id: int | None = None,
+    student_id: str | None = None
+):
+    # incident_date holds ISO dates, so string comparison orders correctly
+    conditions = []
+    if department:
+        conditions.append(DisciplineIncident.department == department)
+    if class_name:
+        conditions.append(DisciplineIncident.class_name == class_name)
+    if date_from:
+        conditions.append(DisciplineIncident.incident_date >= date_from)
+    if date_to:
+        conditions.append(DisciplineIncident.incident_date <= date_to)
+    if committee_member_id:
+        conditions.append(DisciplineIncident.committee_member_id == committee_member_id)
+    if student_id:
+        conditions.append(DisciplineIncident.student_id == student_id)
+    return conditions
+
+def get_incidents_page(
+    db: Session,
+    after_id: int | None = None,
+    limit: int = 50,
+    department: str | None = None,
+    class_name: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    committee_member_id: int | None = None
+):
+    # Keyset pagination on id: the cursor is the last id of the previous page,
+    # so every page is an index range scan no matter how deep the client goes.
+    # committee_member joins in (many-to-one); actions come from one extra IN query
+    query = db.query(DisciplineIncident).options(
+        joinedload(DisciplineIncident.committee_member),
+        selectinload(DisciplineIncident.actions)
+    ).filter(*incident_conditions(
+        department, class_name, date_from, date_to, committee_member_id
+    ))
+    if after_id:
+        query = query.filter(DisciplineIncident.id > after_id)
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(DisciplineIncident.id).limit(limit + 1).all()
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+def get_incidents_by_student_id(db: Session, student_id: str):
+    return db.query(DisciplineIncident).filter(
+        DisciplineIncident.student_id == student_id
+    ).all()
 
 def get_incidents_by_committee_member(db: Session, committee_member_id: int):
     return db.query(DisciplineIncident).filter(
@@ -121,19 +213,74 @@ def get_incidents_by_committee_member(db: Session, committee_member_id: int):
 
 # -------------------- Disciplinary Action Functions --------------------
 
-def create_disciplinary_action(db: Session, action: DisciplinaryActionCreate):
-    db_action = DisciplinaryAction(
-        incident_id=action.incident_id,
-        student_id=action.student_id,
-        action_description=action.action_description,
-        assigned_date=action.assigned_date
-    )
-    db.add(db_action)
-    db.commit()
-    db.refresh(db_action)
-    return db_action
+def create_disciplinary_action(
+    db: Session, action: DisciplinaryActionCreate, idempotency_key: str | None = None, owner: str | None = None
+):
+    return create_disciplinary_actions(db, [action], idempotency_key, owner)[0]
+
+def create_disciplinary_actions(
+    db: Session, actions: list[DisciplinaryActionCreate], idempotency_key: str | None = None, owner: str | None = None
+):
+    # All actions in one transaction: one executemany INSERT ... RETURNING and
+    # one round of summary-table updates, however many incidents are involved
+    try:
+        if idempotency_key:
+            idempotency.claim(db, owner, idempotency_key)
+        db_actions = db.scalars(
+            insert(DisciplinaryAction).returning(DisciplinaryAction, sort_by_parameter_order=True),
+            [action.model_dump() for action in actions]
+        ).all()
+        dashboard_stats.record_actions(db, db_actions)
+        for db_action in db_actions:
+            db.expunge(db_action)
+        db.commit()
+        return db_actions
+    except Exception:
+        db.rollback()
+        raise
 
 def get_actions_by_student_id(db: Session, student_id: str):
     return db.query(DisciplinaryAction).filter(
         DisciplinaryAction.student_id == student_id
     ).all()
+
+def action_conditions(
+    student_id: str | None = None,
+    incident_id: int | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None
+):
+    conditions = []
+    if student_id:
+        conditions.append(DisciplinaryAction.student_id == student_id)
+    if incident_id:
+        conditions.append(DisciplinaryAction.incident_id == incident_id)
+    if date_from:
+        conditions.append(DisciplinaryAction.assigned_date >= date_from)
+    if date_to:
+        conditions.append(DisciplinaryAction.assigned_date <= date_to)
+    return conditions
+
+def get_all_actions(db: Session):
+    # Each action's incident and that incident's committee member in the same query
+    return db.query(DisciplinaryAction).options(
+        joinedload(DisciplinaryAction.incident).joinedload(DisciplineIncident.committee_member)
+    ).all()
+
+# -------------------- API Functions --------------------
+
+def get_rows_page(db: Session, model, fields, conditions=(), after_id: int | None = None, limit: int = 50):
+    # Only the requested columns, as plain dicts: rows go straight to JSON, so
+    # no ORM objects are built. Keyset pagination on id, as in get_incidents_page.
+    query = select(*(getattr(model, field) for field in fields)).where(*conditions)
+    if after_id:
+        query = query.where(model.id > after_id)
+    rows = db.execute(query.order_by(model.id).limit(limit + 1)).mappings().all()
+    next_cursor = rows[limit - 1]["id"] if len(rows) > limit else None
+    return [dict(row) for row in rows[:limit]], next_cursor
+
+def get_row(db: Session, model, fields, row_id: int, conditions=()):
+    row = db.execute(
+        select(*(getattr(model, field) for field in fields)).where(model.id == row_id, *conditions)
+    ).mappings().first()
+    return dict(row) if row else None
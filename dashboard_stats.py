@@ -0,0 +1,224 @@
+"""Incident statistics for the principal and committee dashboards.
+
+    python dashboard_stats.py --rebuild
+"""
+import argparse
+import importlib
+from collections import Counter
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import (
+    CommitteeStat, DisciplinaryAction, DisciplineIncident, IncidentStat, StaffMember, StudentStat
+)
+
+# Dialects with INSERT ... ON CONFLICT. Their modules are imported on first
+# use: the engine has already loaded the one in use, the others are dead weight
+UPSERT_DIALECTS = ("postgresql", "sqlite")
+
+def upsert_for(db: Session):
+    name = db.get_bind().dialect.name
+    if name not in UPSERT_DIALECTS:
+        return None
+    return importlib.import_module(f"sqlalchemy.dialects.{name}").insert
+
+REPEAT_OFFENDER_MIN_INCIDENTS = 2
+REPEAT_OFFENDER_LIMIT = 10
+
+def month_of(incident_date: str):
+    # incident_date holds ISO dates (YYYY-MM-DD)
+    return incident_date[:7]
+
+# -------------------- Incremental updates --------------------
+
+def _increment(db: Session, model, key: dict, increments: dict, assign: dict | None = None):
+    # "Insert or add to the counters", so concurrent writers never lose a count
+    table = model.__table__
+    upsert = upsert_for(db)
+    if upsert is None:
+        # No ON CONFLICT: add in place, insert when the row is missing, and if
+        # another writer inserted it first, add to theirs
+        add = (
+            update(model)
+            .where(*(table.c[name] == value for name, value in key.items()))
+            .values({**{name: table.c[name] + amount for name, amount in increments.items()}, **(assign or {})})
+        )
+        if db.execute(add).rowcount == 0:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(model).values(**key, **increments, **(assign or {})))
+            except IntegrityError:
+                db.execute(add)
+        return
+    statement = upsert(model).values(**key, **increments, **(assign or {}))
+    db.execute(statement.on_conflict_do_update(
+        index_elements=list(key),
+        set_={
+            **{name: table.c[name] + statement.excluded[name] for name in increments},
+            **{name: statement.excluded[name] for name in (assign or {})},
+        },
+    ))
+
+def record_incident(db: Session, incident: DisciplineIncident):
+    _increment(db, IncidentStat, {
+        "department": incident.department,
+        "class_name": incident.class_name,
+        "month": month_of(incident.incident_date),
+    }, {"incidents": 1})
+    if incident.committee_member_id:
+        _increment(db, CommitteeStat, {"committee_member_id": incident.committee_member_id}, {"incidents": 1})
+    _increment(db, StudentStat, {"student_id": incident.student_id}, {"incidents": 1},
+               {"student_name": incident.student_name})
+
+def record_actions(db: Session, actions):
+    # One query for the incidents and one for which of them already had an
+    # action; each incident moves from open to actioned with its first action.
+    # The incidents are locked first, so two concurrent first actions on one
+    # incident cannot both see no earlier action: the second waits, then sees
+    # the first. NO KEY UPDATE on Postgres (key_share) does not conflict with
+    # the KEY SHARE locks the action INSERTs' foreign key checks hold; SQLite
+    # has no row locks and runs one writer at a time anyway.
+    incident_ids = {action.incident_id for action in actions}
+    incidents = {
+        incident.id: incident
+        for incident in db.scalars(
+            select(DisciplineIncident)
+            .where(DisciplineIncident.id.in_(incident_ids))
+            .order_by(DisciplineIncident.id)
+            .with_for_update(key_share=True)
+        )
+    }
+    already_actioned = set(db.scalars(
+        select(DisciplinaryAction.incident_id).where(
+            DisciplinaryAction.incident_id.in_(incident_ids),
+            DisciplinaryAction.id.not_in([action.id for action in actions])
+        ).distinct()
+    ))
+    actioned = Counter()
+    committee = {}
+    for action in actions:
+        incident = incidents.get(action.incident_id)
+        if incident is None:
+            continue
+        first_action = incident.id not in already_actioned
+        already_actioned.add(incident.id)
+        if first_action:
+            actioned[(incident.department, incident.class_name, month_of(incident.incident_date))] += 1
+        if incident.committee_member_id:
+            counts = committee.setdefault(incident.committee_member_id, [0, 0])
+            counts[0] += 1
+            counts[1] += first_action
+    for (department, class_name, month), count in actioned.items():
+        _increment(db, IncidentStat, {"department": department, "class_name": class_name, "month": month},
+                   {"actioned": count})
+    for committee_member_id, (count, first_actions) in committee.items():
+        _increment(db, CommitteeStat, {"committee_member_id": committee_member_id},
+                   {"actions": count, "actioned": first_actions})
+
+# -------------------- Full rebuild --------------------
+
+def rebuild(conn):
+    # Recomputes every summary table with GROUP BY. Used by the migration that
+    # creates them and after bulk loads that bypass crud (benchmarks/seed.py).
+    for model in (IncidentStat, CommitteeStat, StudentStat):
+        conn.execute(delete(model))
+
+    action_counts = (
+        select(DisciplinaryAction.incident_id, func.count().label("actions"))
+        .group_by(DisciplinaryAction.incident_id)
+        .subquery()
+    )
+    incidents = (
+        select(DisciplineIncident, action_counts.c.actions)
+        .outerjoin(action_counts, action_counts.c.incident_id == DisciplineIncident.id)
+        .subquery()
+    )
+    actioned = func.sum(case((incidents.c.actions.is_not(None), 1), else_=0))
+    month = func.substr(incidents.c.incident_date, 1, 7)
+
+    conn.execute(insert(IncidentStat).from_select(
+        ["department", "class_name", "month", "incidents", "actioned"],
+        select(incidents.c.department, incidents.c.class_name, month, func.count(), actioned)
+        .group_by(incidents.c.department, incidents.c.class_name, month)
+    ))
+    conn.execute(insert(CommitteeStat).from_select(
+        ["committee_member_id", "incidents", "actioned", "actions"],
+        select(
+            incidents.c.committee_member_id, func.count(), actioned,
+            func.coalesce(func.sum(incidents.c.actions), 0)
+        )
+        .where(incidents.c.committee_member_id.is_not(None))
+        .group_by(incidents.c.committee_member_id)
+    ))
+    conn.execute(insert(StudentStat).from_select(
+        ["student_id", "student_name", "incidents"],
+        select(DisciplineIncident.student_id, func.max(DisciplineIncident.student_name), func.count())
+        .group_by(DisciplineIncident.student_id)
+    ))
+
+# -------------------- Reads --------------------
+
+def _grouped(db: Session, column):
+    rows = db.execute(
+        select(column, func.sum(IncidentStat.incidents), func.sum(IncidentStat.actioned))
+        .group_by(column).order_by(column)
+    )
+    return [{"key": key, "incidents": total, "actioned": done, "open": total - done} for key, total, done in rows]
+
+def get_statistics(db: Session):
+    # Every query reads the small summary tables, never the incident table.
+    # That keeps the dashboards (this and get_committee_statistics) cheap
+    # enough to render live on every request instead of page-caching them
+    by_department = _grouped(db, IncidentStat.department)
+    incidents = sum(row["incidents"] for row in by_department)
+    actioned = sum(row["actioned"] for row in by_department)
+    committee = db.execute(
+        select(
+            StaffMember.id, StaffMember.name,
+            func.coalesce(CommitteeStat.incidents, 0), func.coalesce(CommitteeStat.actioned, 0),
+            func.coalesce(CommitteeStat.actions, 0)
+        )
+        .outerjoin(CommitteeStat, CommitteeStat.committee_member_id == StaffMember.id)
+        .where(StaffMember.role == "committee")
+        .order_by(StaffMember.id)
+    )
+    repeat_offenders = db.execute(
+        select(StudentStat.student_id, StudentStat.student_name, StudentStat.incidents)
+        .where(StudentStat.incidents >= REPEAT_OFFENDER_MIN_INCIDENTS)
+        .order_by(StudentStat.incidents.desc(), StudentStat.student_id)
+        .limit(REPEAT_OFFENDER_LIMIT)
+    )
+    return {
+        "incidents": incidents,
+        "actioned": actioned,
+        "open": incidents - actioned,
+        "by_department": by_department,
+        "by_class": _grouped(db, IncidentStat.class_name),
+        "by_month": _grouped(db, IncidentStat.month),
+        "committee": [
+            {"id": id, "name": name, "incidents": total, "actioned": done, "open": total - done, "actions": actions}
+            for id, name, total, done, actions in committee
+        ],
+        "repeat_offenders": [
+            {"student_id": student_id, "student_name": name, "incidents": count}
+            for student_id, name, count in repeat_offenders
+        ],
+    }
+
+def get_committee_statistics(db: Session, committee_member_id: int):
+    row = db.get(CommitteeStat, committee_member_id)
+    incidents, actioned, actions = (row.incidents, row.actioned, row.actions) if row else (0, 0, 0)
+    return {"incidents": incidents, "actioned": actioned, "open": incidents - actioned, "actions": actions}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute the dashboard summary tables")
+    parser.add_argument("--rebuild", action="store_true", required=True)
+    parser.parse_args()
+
+    from database import engine
+
+    with engine.begin() as conn:
+        rebuild(conn)
+    print("Summary tables rebuilt")
@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+
+from sqlalchemy import select
+
+import settings
+from crud import action_conditions, incident_conditions
+from database import read_engine
+from models import DisciplineIncident, DisciplinaryAction
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORTS = {
+    "incidents": (DisciplineIncident, incident_conditions),
+    "actions": (DisciplinaryAction, action_conditions),
+}
+
+def export_statement(kind: str, filters: dict):
+    model, conditions = EXPORTS[kind]
+    return select(*model.__table__.columns).where(*conditions(**filters)).order_by(model.id)
+
+def stream_export(kind: str, fmt: str, filters: dict):
+    # Server-side cursor: rows arrive EXPORT_CHUNK_SIZE at a time and each chunk
+    # is encoded and handed to the response before the next one is fetched, so
+    # memory stays flat however many rows match.
+    statement = export_statement(kind, filters)
+    columns = [column.name for column in statement.selected_columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(columns)
+    with read_engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=settings.EXPORT_CHUNK_SIZE
+        ).execute(statement)
+        for rows in result.partitions():
+            if fmt == "csv":
+                writer.writerows(rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(zip(columns, row))))
+                    buffer.write("\n")
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
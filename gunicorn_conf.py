@@ -0,0 +1,31 @@
+"""Production profile: several uvicorn workers under gunicorn.
+
+    gunicorn -c gunicorn_conf.py main:app
+
+The app is imported once in the master and forked (preload_app), so workers
+share its memory pages and boot fast. The master applies pending migrations
+and purges expired idempotency keys before any worker starts (leave
+MIGRATE_ON_STARTUP off so the workers do not repeat it).
+Database pools and the logging thread are reset in each child after the fork
+(database.py, logging_setup.py). Point CACHE_URL at Redis so role
+lookups, session revocation and login throttling are shared by all workers.
+"""
+import settings
+
+bind = settings.BIND
+workers = settings.WEB_CONCURRENCY
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# Recycle workers now and then, with jitter so they do not restart together
+max_requests = 10000
+max_requests_jitter = 1000
+graceful_timeout = 30
+keepalive = 5
+
+def on_starting(server):
+    import database
+    import main
+
+    main.startup_tasks()
+    # Workers open their own connections; keep none in the master
+    database.engine.dispose()
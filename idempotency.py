@@ -0,0 +1,81 @@
+import itertools
+import time
+import uuid
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import settings
+from dashboard_stats import upsert_for
+from models import IdempotencyKey
+
+# Forms carry a random key (hidden idempotency_key field, or an
+# Idempotency-Key header from API clients). The write path claims the key in
+# the same transaction as its inserts, so a double-click or a retried POST
+# is applied once, and a request that failed and rolled back can be retried.
+# A key is remembered for IDEMPOTENCY_KEY_TTL: after that it can be claimed
+# again, and claims delete expired keys a batch at a time as they go.
+
+class DuplicateRequest(Exception):
+    pass
+
+_claims = itertools.count(1)
+
+def new_key():
+    return uuid.uuid4().hex
+
+def claim(db: Session, owner: str, key: str):
+    now = int(time.time())
+    expired = IdempotencyKey.created_at < now - settings.IDEMPOTENCY_KEY_TTL
+    values = {"owner": owner, "key": key, "created_at": now}
+    if next(_claims) % settings.IDEMPOTENCY_PURGE_EVERY == 0:
+        _delete_expired(db, settings.IDEMPOTENCY_KEY_TTL, settings.IDEMPOTENCY_PURGE_BATCH)
+    upsert = upsert_for(db)
+    if upsert is not None:
+        # A concurrent claim of the same key waits on the unique index and
+        # then inserts nothing; an expired key is taken over
+        statement = upsert(IdempotencyKey).values(**values)
+        claimed = db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["owner", "key"],
+                set_={"created_at": statement.excluded.created_at},
+                where=expired,
+            ).returning(IdempotencyKey.key)
+        ).first()
+        if claimed is None:
+            raise DuplicateRequest(key)
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(IdempotencyKey).values(**values))
+    except IntegrityError:
+        taken_over = db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.owner == owner, IdempotencyKey.key == key, expired)
+            .values(created_at=now)
+        )
+        if taken_over.rowcount == 0:
+            raise DuplicateRequest(key)
+
+def _delete_expired(db: Session, max_age: float, limit: int | None = None):
+    cutoff = int(time.time() - max_age)
+    if limit is not None:
+        # Oldest first, up to about limit rows (a batch ends at a created_at
+        # value, so keys sharing it go together); the index on created_at
+        # finds the boundary without a scan
+        boundary = db.scalar(
+            select(IdempotencyKey.created_at)
+            .where(IdempotencyKey.created_at < cutoff)
+            .order_by(IdempotencyKey.created_at)
+            .offset(limit - 1)
+            .limit(1)
+        )
+        if boundary is not None:
+            cutoff = boundary + 1
+    return db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff)).rowcount
+
+def purge(db: Session, max_age: float):
+    deleted = _delete_expired(db, max_age)
+    db.commit()
+    return deleted
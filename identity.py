@@ -0,0 +1,34 @@
+from typing import NamedTuple
+
+from cache_backend import cache
+
+class Identity(NamedTuple):
+    id: int
+    name: str
+    role: str
+
+def account_kind(identity: Identity):
+    return "student" if identity.role == "student" else "staff"
+
+class AccountGenerations:
+    # A counter per account in the cache backend, bumped by crud whenever the
+    # account is updated or deleted. Session tokens carry the value seen at
+    # login, and a token older than its account's generation no longer
+    # authorizes anything, so a demoted or deleted user is locked out at once
+    # with one cache read per request and no DB lookup. Only ever compared as
+    # "token >= current": a worker whose per-process backend never saw a bump
+    # reads 0 and accepts fresh tokens from the others.
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def _key(self, kind: str, account_id: int):
+        return f"account:{kind}:{account_id}:generation"
+
+    def get(self, kind: str, account_id: int):
+        return self.backend.get(self._key(kind, account_id)) or 0
+
+    def bump(self, kind: str, account_id: int):
+        self.backend.incr(self._key(kind, account_id))
+
+generations = AccountGenerations(cache)
@@ -0,0 +1,101 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+
+import settings
+
+# Id of the request being handled, attached to every record logged during it
+request_id: ContextVar[str] = ContextVar("request_id", default="-")
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+
+class RequestIdFilter(logging.Filter):
+    # Runs before the record is queued, while the request's context is current
+    def filter(self, record):
+        record.request_id = request_id.get()
+        return True
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    # QueueHandler.prepare() would run the full formatter on the caller's
+    # thread. Only merge the arguments here, so later mutation of an argument
+    # cannot change the message, and leave formatting to the listener.
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+_listener = None
+
+def _start_listener(records, handler):
+    global _listener
+    _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+    # Flush whatever is still queued on interpreter exit
+    atexit.register(_listener.stop)
+
+def configure_logging():
+    global _listener
+    if _listener is not None:
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(settings.LOG_LEVEL)
+    if settings.LOG_ASYNC:
+        records = queue.SimpleQueue()
+        front = DeferredQueueHandler(records)
+        front.addFilter(RequestIdFilter())
+        root.addHandler(front)
+        _start_listener(records, handler)
+        # Threads do not survive fork(): each worker of a preloading server
+        # starts its own listener on the queue it inherited
+        os.register_at_fork(after_in_child=lambda: _start_listener(records, handler))
+    else:
+        handler.addFilter(RequestIdFilter())
+        root.addHandler(handler)
+
+class RequestIdMiddleware:
+    # Reuses an incoming X-Request-ID (e.g. from a proxy) or makes one, and
+    # echoes it on the response so a client report can be matched to the logs
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        incoming = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")
+        rid = incoming[:64] if incoming.isprintable() and incoming else uuid.uuid4().hex
+        token = request_id.set(rid)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", rid.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,167 @@
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# Minimal Prometheus text-format metrics: counters and histograms with labels,
+# request middleware, and SQLAlchemy hooks. Exposed by GET /metrics.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{str(value).replace(chr(34), chr(39))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    labels = _format_labels(self.labels, label_values, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+                labels = _format_labels(self.labels, label_values, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {count}")
+        return lines
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Request latency", ("method", "route"))
+REQUEST_DB_QUERIES = Histogram("http_request_db_queries", "SQL statements per request", ("route",), COUNT_BUCKETS)
+REQUEST_DB_SECONDS = Histogram("http_request_db_seconds", "Time spent in SQL per request", ("route",))
+POOL_CHECKOUT_SECONDS = Histogram("db_pool_checkout_seconds", "Wait for a pooled connection", ("pool",))
+TEMPLATE_RENDER_SECONDS = Histogram("template_render_seconds", "Jinja2 render time", ("template",))
+
+REGISTRY = [REQUESTS, REQUEST_SECONDS, REQUEST_DB_QUERIES, REQUEST_DB_SECONDS, POOL_CHECKOUT_SECONDS, TEMPLATE_RENDER_SECONDS]
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+# Per-request SQL tally. The object is shared by reference, so statements run
+# in threadpool workers (which copy the context) still add to it.
+current_stats: ContextVar[RequestStats | None] = ContextVar("current_stats", default=None)
+
+def render_metrics(extra_lines=()):
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.extend(extra_lines)
+    return "\n".join(lines) + "\n"
+
+# -------------------- Instrumentation --------------------
+
+def route_template(scope):
+    # FastAPI stores the matched route in the scope; using its path template
+    # (/edit_staff/{staff_id}) keeps label cardinality bounded
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    return "unmatched"
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_stats.reset(token)
+            route = route_template(scope)
+            REQUESTS.inc(scope["method"], route, status_code)
+            REQUEST_SECONDS.observe(time.perf_counter() - start, scope["method"], route)
+            REQUEST_DB_QUERIES.observe(stats.queries, route)
+            REQUEST_DB_SECONDS.observe(stats.db_seconds, route)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = current_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+def _time_checkouts(pool, pool_name: str):
+    if hasattr(pool, "_do_get"):
+        # QueuePool blocks in _do_get while every connection is checked out;
+        # SQLAlchemy has no public "before checkout" event to time this with
+        do_get = pool._do_get
+
+        def timed_do_get():
+            start = time.perf_counter()
+            try:
+                return do_get()
+            finally:
+                POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start, pool_name)
+
+        pool._do_get = timed_do_get
+
+def instrument_engine(engine, pool_name: str):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    _time_checkouts(engine.pool, pool_name)
+    # dispose() swaps in a fresh pool (after a fork, in the gunicorn master,
+    # at shutdown); wrap that one too
+    event.listen(engine, "engine_disposed", lambda disposed: _time_checkouts(disposed.pool, pool_name))
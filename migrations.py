@@ -0,0 +1,211 @@
+import argparse
+import logging
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Text, MetaData, Table, inspect, select, text
+from sqlalchemy.schema import CreateTable
+
+import dashboard_stats
+import search
+from database import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+# Applied versions are recorded here, one row per migration
+migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+)
+
+MIGRATIONS = []
+
+def migration(version: int, description: str):
+    def register(upgrade):
+        MIGRATIONS.append((version, description, upgrade))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return upgrade
+    return register
+
+def create_indexes(conn, *indexes):
+    for index in indexes:
+        index.create(bind=conn, checkfirst=True)
+
+# -------------------- Migrations --------------------
+
+# Each migration spells out the tables and indexes it creates, as they were
+# at that version, rather than reading them from models.py: a column or index
+# added to a model later must arrive through its own migration, not appear
+# early on a fresh database and collide with that migration.
+
+@migration(1, "create base tables")
+def create_base_tables(conn):
+    # Databases created by the old create_all() at import time already have
+    # these tables. CreateTable leaves indexes out; those belong to version 2.
+    metadata = MetaData()
+    tables = [
+        Table(
+            "staff_members", metadata,
+            Column("id", Integer, primary_key=True),
+            Column("name", String, nullable=False),
+            Column("username", String, unique=True, nullable=False),
+            Column("password", String, nullable=False),
+            Column("role", String, nullable=False),
+        ),
+        Table(
+            "students", metadata,
+            Column("id", Integer, primary_key=True),
+            Column("name", String, nullable=False),
+            Column("username", String, unique=True, nullable=False),
+            Column("password", String, nullable=False),
+        ),
+        Table(
+            "discipline_incidents", metadata,
+            Column("id", Integer, primary_key=True),
+            Column("student_id", String, nullable=False),
+            Column("student_name", String, nullable=False),
+            Column("class_name", String, nullable=False),
+            Column("department", String, nullable=False),
+            Column("committee_member_id", Integer, ForeignKey("staff_members.id"), nullable=True),
+            Column("incident_date", String, nullable=False),
+            Column("description", Text, nullable=False),
+        ),
+        Table(
+            "disciplinary_actions", metadata,
+            Column("id", Integer, primary_key=True),
+            Column("incident_id", Integer, ForeignKey("discipline_incidents.id"), nullable=False),
+            Column("student_id", String, nullable=False),
+            Column("action_description", Text, nullable=False),
+            Column("assigned_date", String, nullable=False),
+        ),
+    ]
+    existing = inspect(conn)
+    for table in tables:
+        if not existing.has_table(table.name):
+            conn.execute(CreateTable(table))
+
+@migration(2, "index incident and action lookup columns")
+def add_lookup_indexes(conn):
+    # Index needs only the columns it covers
+    metadata = MetaData()
+    staff_members = Table("staff_members", metadata, Column("id", Integer))
+    students = Table("students", metadata, Column("id", Integer))
+    incidents = Table(
+        "discipline_incidents", metadata,
+        Column("id", Integer), Column("student_id", String), Column("committee_member_id", Integer),
+        Column("department", String), Column("class_name", String),
+    )
+    actions = Table(
+        "disciplinary_actions", metadata,
+        Column("id", Integer), Column("incident_id", Integer), Column("student_id", String),
+    )
+    create_indexes(
+        conn,
+        # Primary-key indexes the old create_all() made (index=True on id)
+        Index("ix_staff_members_id", staff_members.c.id),
+        Index("ix_students_id", students.c.id),
+        Index("ix_discipline_incidents_id", incidents.c.id),
+        Index("ix_disciplinary_actions_id", actions.c.id),
+        Index("ix_discipline_incidents_student_id", incidents.c.student_id),
+        Index("ix_discipline_incidents_committee_member_id_id", incidents.c.committee_member_id, incidents.c.id),
+        Index(
+            "ix_discipline_incidents_department_class_name_id",
+            incidents.c.department, incidents.c.class_name, incidents.c.id
+        ),
+        Index("ix_disciplinary_actions_student_id", actions.c.student_id),
+        Index("ix_disciplinary_actions_incident_id", actions.c.incident_id),
+    )
+
+@migration(3, "dashboard summary tables")
+def add_summary_tables(conn):
+    metadata = MetaData()
+    Table(
+        "incident_stats", metadata,
+        Column("department", String, primary_key=True),
+        Column("class_name", String, primary_key=True),
+        Column("month", String, primary_key=True),
+        Column("incidents", Integer, nullable=False),
+        Column("actioned", Integer, nullable=False),
+    )
+    Table(
+        "committee_stats", metadata,
+        Column("committee_member_id", Integer, primary_key=True),
+        Column("incidents", Integer, nullable=False),
+        Column("actioned", Integer, nullable=False),
+        Column("actions", Integer, nullable=False),
+    )
+    student_stats = Table(
+        "student_stats", metadata,
+        Column("student_id", String, primary_key=True),
+        Column("student_name", String, nullable=False),
+        Column("incidents", Integer, nullable=False),
+    )
+    Index("ix_student_stats_incidents", student_stats.c.incidents)
+    metadata.create_all(bind=conn, checkfirst=True)
+    # Fills them with the current code (dashboard_stats.py), so a later change
+    # to these tables needs a migration that leaves rebuild() working here
+    dashboard_stats.rebuild(conn)
+
+@migration(4, "full-text search indexes")
+def add_search_indexes(conn):
+    search.setup_search(conn)
+
+@migration(5, "idempotency keys")
+def add_idempotency_keys(conn):
+    metadata = MetaData()
+    idempotency_keys = Table(
+        "idempotency_keys", metadata,
+        Column("owner", String, primary_key=True),
+        Column("key", String, primary_key=True),
+        Column("created_at", Integer, nullable=False),
+    )
+    Index("ix_idempotency_keys_created_at", idempotency_keys.c.created_at)
+    metadata.create_all(bind=conn, checkfirst=True)
+
+@migration(6, "table version counters")
+def add_table_versions(conn):
+    metadata = MetaData()
+    versions = Table(
+        "table_versions", metadata,
+        Column("name", String, primary_key=True),
+        Column("version", Integer, nullable=False),
+    )
+    metadata.create_all(bind=conn, checkfirst=True)
+    existing = set(conn.scalars(select(versions.c.name)))
+    missing = [{"name": name, "version": 0} for name in ("students", "staff_members") if name not in existing]
+    if missing:
+        conn.execute(versions.insert(), missing)
+
+# -------------------- Runner --------------------
+
+def current_version(conn):
+    migration_metadata.create_all(bind=conn, checkfirst=True)
+    return conn.execute(
+        select(schema_migrations.c.version).order_by(schema_migrations.c.version.desc())
+    ).scalar() or 0
+
+def upgrade(bind=None, target: int | None = None):
+    bind = bind or default_engine
+    with bind.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # Serialize workers that boot at the same time
+            conn.execute(text("SELECT pg_advisory_xact_lock(7243001)"))
+        version = current_version(conn)
+        applied = []
+        for number, description, apply in MIGRATIONS:
+            if number <= version or (target is not None and number > target):
+                continue
+            logger.info("Applying migration %s: %s", number, description)
+            apply(conn)
+            conn.execute(schema_migrations.insert().values(version=number, description=description))
+            applied.append(number)
+    return applied
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--target", type=int, default=None, help="stop after this version")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    applied = upgrade(target=args.target)
+    print(f"Applied migrations: {applied or 'none (already up to date)'}")
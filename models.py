@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -10,6 +10,9 @@ class StaffMember(Base):
     password = Column(String, nullable=False)
     role = Column(String, nullable=False)
 
+    # passive_deletes: leave FK enforcement to the database, as before
+    assigned_incidents = relationship("DisciplineIncident", back_populates="committee_member", passive_deletes=True)
+
 class Student(Base):
     __tablename__ = "students"
     id = Column(Integer, primary_key=True, index=True)
@@ -28,6 +31,18 @@ class DisciplineIncident(Base):
     incident_date = Column(String, nullable=False)
     description = Column(Text, nullable=False)
 
+    # List views load these explicitly (see crud) instead of lazily per row
+    committee_member = relationship("StaffMember", back_populates="assigned_incidents")
+    actions = relationship("DisciplinaryAction", back_populates="incident", passive_deletes=True)
+
+    # Composite indexes end in id so keyset pagination can walk them in order.
+    # Existing databases receive these through migrations.py, not create_all.
+    __table_args__ = (
+        Index("ix_discipline_incidents_student_id", "student_id"),
+        Index("ix_discipline_incidents_committee_member_id_id", "committee_member_id", "id"),
+        Index("ix_discipline_incidents_department_class_name_id", "department", "class_name", "id"),
+    )
+
 class DisciplinaryAction(Base):
     __tablename__ = "disciplinary_actions"
     id = Column(Integer, primary_key=True, index=True)
@@ -35,3 +50,55 @@ class DisciplinaryAction(Base):
     student_id = Column(String, nullable=False)
     action_description = Column(Text, nullable=False)
     assigned_date = Column(String, nullable=False)
+
+    incident = relationship("DisciplineIncident", back_populates="actions")
+
+    __table_args__ = (
+        Index("ix_disciplinary_actions_student_id", "student_id"),
+        Index("ix_disciplinary_actions_incident_id", "incident_id"),
+    )
+
+# Summary tables behind the dashboard statistics. dashboard_stats.py bumps the
+# counters in the same transaction as each incident/action write.
+
+class IncidentStat(Base):
+    __tablename__ = "incident_stats"
+    department = Column(String, primary_key=True)
+    class_name = Column(String, primary_key=True)
+    month = Column(String, primary_key=True)  # YYYY-MM of incident_date
+    incidents = Column(Integer, nullable=False, default=0)
+    actioned = Column(Integer, nullable=False, default=0)
+
+class CommitteeStat(Base):
+    __tablename__ = "committee_stats"
+    committee_member_id = Column(Integer, primary_key=True)
+    incidents = Column(Integer, nullable=False, default=0)
+    actioned = Column(Integer, nullable=False, default=0)
+    actions = Column(Integer, nullable=False, default=0)
+
+class StudentStat(Base):
+    __tablename__ = "student_stats"
+    student_id = Column(String, primary_key=True)
+    student_name = Column(String, nullable=False)
+    incidents = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_student_stats_incidents", "incidents"),
+    )
+
+class IdempotencyKey(Base):
+    # Keys of form/API submissions already applied, per owner (idempotency.py)
+    __tablename__ = "idempotency_keys"
+    owner = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    created_at = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+class TableVersion(Base):
+    # Change counter per table, bumped by every write (table_versions.py)
+    __tablename__ = "table_versions"
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,93 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+
+from assets import load_manifest
+
+class PageCache:
+    # Bounded LRU of rendered templates with ETag revalidation.
+    #
+    # Routes opt in by rendering through render() instead of
+    # templates.TemplateResponse. Static pages are cached until evicted;
+    # per-user pages pass the user (part of the key) and a short ttl. The
+    # ETag is a hash of the body, so it agrees across workers and a client
+    # revalidating with If-None-Match gets a 304 without a re-render.
+
+    def __init__(self, templates, maxsize: int):
+        self.templates = templates
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._template_digests = {}
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] is not None and entry[2] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key, body: bytes, ttl: float | None):
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        entry = (body, etag, time.monotonic() + ttl if ttl is not None else None)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def render(self, request: Request, name: str, context: dict | None = None, ttl: float | None = None, user=None):
+        # The query string is part of the key since pages echo ?message=...
+        key = (name, user, request.url.query)
+        entry = self._lookup(key)
+        if entry is None:
+            context = dict(context or {}, request=request)
+            body = self.templates.get_template(name).render(context).encode()
+            entry = self._store(key, body, ttl)
+        body, etag, _ = entry
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "private, no-cache" if user is not None else "no-cache",
+        }
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(body, headers=headers)
+
+    def _template_digest(self, name: str):
+        # Template source plus the asset manifest it links through; either
+        # changing (a deploy) must change the ETag even if the rows did not
+        digest = self._template_digests.get(name)
+        if digest is None:
+            source, _, _ = self.templates.env.loader.get_source(self.templates.env, name)
+            manifest = repr(sorted(load_manifest().items()))
+            digest = hashlib.blake2b((source + manifest).encode(), digest_size=12).hexdigest()
+            self._template_digests[name] = digest
+        return digest
+
+    def versioned_etag(self, request: Request, name: str, versions, user=None):
+        # Weak ETag for a page rendered from whole tables: derived from their
+        # version counters instead of the body, so it is known before any row
+        # is loaded. Weak, since compression changes the bytes sent.
+        key = repr((self._template_digest(name), versions, user, request.url.query))
+        return 'W/"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self._template_digests.clear()
+
+def etag_matches(request: Request, etag: str):
+    # Weak comparison (RFC 9110 If-None-Match): W/ prefixes are ignored
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
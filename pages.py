@@ -0,0 +1,19 @@
+from fastapi import Request
+
+import settings
+from page_cache import PageCache
+from templating import make_templates
+
+# Shared by the HTML routers (routers/). Only they import this module, so an
+# app built without them does not load Jinja2.
+templates = make_templates("templates")
+page_cache = PageCache(templates, maxsize=settings.PAGE_CACHE_SIZE)
+
+def optional_int(value: str | None):
+    # HTML filter forms submit empty strings for blank fields. Anything else
+    # that is not a number raises ValueError, for the caller to answer with 400
+    return int(value) if value else None
+
+def submitted_key(request: Request, idempotency_key: str):
+    # Hidden field rendered into our forms, or the header from API clients
+    return idempotency_key or request.headers.get("idempotency-key") or None
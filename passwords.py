@@ -0,0 +1,111 @@
+import base64
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+import settings
+from cache_backend import LocalBackend, cache
+
+# Stored format: pbkdf2_sha256$<iterations>$<salt>$<hash>. Rows that do not
+# start with the prefix are legacy plaintext and get rehashed on next login.
+ALGORITHM = "pbkdf2_sha256"
+
+def _pbkdf2(password: str, salt: bytes, iterations: int):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+def hash_password(password: str, iterations: int | None = None):
+    iterations = iterations or settings.PASSWORD_HASH_ITERATIONS
+    salt = secrets.token_bytes(16)
+    digest = _pbkdf2(password, salt, iterations)
+    return "$".join([
+        ALGORITHM,
+        str(iterations),
+        base64.b64encode(salt).decode(),
+        base64.b64encode(digest).decode(),
+    ])
+
+def _parse(stored: str):
+    # (iterations, salt, digest) for a well-formed hash, else None
+    parts = stored.split("$")
+    if len(parts) != 4 or parts[0] != ALGORITHM or not parts[1].isdigit() or int(parts[1]) < 1:
+        return None
+    try:
+        salt = base64.b64decode(parts[2], validate=True)
+        digest = base64.b64decode(parts[3], validate=True)
+    except ValueError:
+        return None
+    if not salt or len(digest) != hashlib.sha256().digest_size:
+        return None
+    return int(parts[1]), salt, digest
+
+def is_hashed(stored: str):
+    return _parse(stored) is not None
+
+def verify_password(password: str, stored: str):
+    # Returns (matches, needs_rehash)
+    parsed = _parse(stored)
+    if parsed is None:
+        if stored.startswith(ALGORITHM + "$"):
+            # Looks like a hash but is not one (a corrupt row): nothing matches
+            return False, True
+        return hmac.compare_digest(password.encode(), stored.encode()), True
+    iterations, salt, digest = parsed
+    matches = hmac.compare_digest(_pbkdf2(password, salt, iterations), digest)
+    return matches, iterations != settings.PASSWORD_HASH_ITERATIONS
+
+class VerifyCache:
+    # Remembers recent verify results so repeated logins (and repeated bad
+    # guesses) skip the KDF, and stops hashing for a username that has failed
+    # too often within the window. Keys are keyed HMACs of the stored hash and
+    # the candidate password, never the password itself. Results stay in the
+    # process; failure counts live in the cache backend, so with a shared
+    # backend the lockout holds across workers.
+
+    def __init__(self, ttl: float, maxsize: int, max_failures: int, failure_window: float, backend=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.max_failures = max_failures
+        self.failure_window = failure_window
+        self.backend = backend or LocalBackend(maxsize)
+        self._key = secrets.token_bytes(32)
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cache_key(self, stored: str, password: str):
+        return hmac.new(self._key, f"{stored}\0{password}".encode(), hashlib.sha256).digest()
+
+    def is_locked(self, username: str):
+        return (self.backend.get(f"login_failures:{username}") or 0) >= self.max_failures
+
+    def record_failure(self, username: str):
+        # The window starts at the first failure and the counter expires with it
+        self.backend.incr(f"login_failures:{username}", self.failure_window)
+
+    def record_success(self, username: str):
+        self.backend.delete(f"login_failures:{username}")
+
+    def verify(self, password: str, stored: str):
+        key = self._cache_key(stored, password)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._results.get(key)
+            if entry and entry[1] > now:
+                self._results.move_to_end(key)
+                return entry[0]
+        result = verify_password(password, stored)
+        with self._lock:
+            self._results[key] = (result, now + self.ttl)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+verify_cache = VerifyCache(
+    ttl=settings.PASSWORD_VERIFY_CACHE_TTL,
+    maxsize=settings.PASSWORD_VERIFY_CACHE_SIZE,
+    max_failures=settings.LOGIN_MAX_FAILURES,
+    failure_window=settings.LOGIN_FAILURE_WINDOW,
+    backend=cache,
+)
@@ -0,0 +1,75 @@
+import threading
+import time
+from typing import NamedTuple
+
+import settings
+from cache_backend import cache
+
+class StaffEntry(NamedTuple):
+    id: int
+    name: str
+    username: str
+    role: str
+
+class DirectorySnapshot:
+    def __init__(self, entries):
+        self.by_id = {entry.id: entry for entry in entries}
+        self.by_role = {}
+        for entry in sorted(entries):
+            self.by_role.setdefault(entry.role, []).append(entry)
+
+    def members(self, role: str):
+        return self.by_role.get(role, [])
+
+    def member(self, staff_id: int):
+        return self.by_id.get(staff_id)
+
+class RoleDirectory:
+    # Per-process snapshot of every staff member grouped by role, serving the
+    # committee dropdown and committee id validation without a query. Staff
+    # writes through crud (and staff bulk imports) bump a generation counter
+    # in the cache backend; a snapshot is used only while it matches, so with
+    # a shared backend every worker drops it after a write anywhere. The TTL
+    # bounds staleness with the per-process backend.
+
+    GENERATION_KEY = "role_directory:generation"
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._snapshot = None
+        self._snapshot_generation = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def generation(self):
+        return self.backend.get(self.GENERATION_KEY) or 0
+
+    def get(self):
+        generation = self.generation()
+        with self._lock:
+            if (
+                self._snapshot is not None
+                and self._snapshot_generation == generation
+                and self._expires_at > time.monotonic()
+            ):
+                return self._snapshot
+            return None
+
+    def put(self, entries, generation: int):
+        # A load that raced with a write (generation moved on) is served to its
+        # caller but not kept, so the write is never masked by older rows
+        snapshot = DirectorySnapshot(entries)
+        if generation == self.generation():
+            with self._lock:
+                self._snapshot = snapshot
+                self._snapshot_generation = generation
+                self._expires_at = time.monotonic() + self.ttl
+        return snapshot
+
+    def invalidate(self):
+        self.backend.incr(self.GENERATION_KEY)
+        with self._lock:
+            self._snapshot = None
+
+directory = RoleDirectory(cache, ttl=settings.ROLE_DIRECTORY_TTL)
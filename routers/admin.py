@@ -0,0 +1,451 @@
+from fastapi import APIRouter, Depends, Request, Form, HTTPException, Query, File, UploadFile
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from fastapi.concurrency import run_in_threadpool
+import logging
+
+import schemas
+import async_crud
+from async_crud import AnySession
+from auth import require_role
+from identity import Identity
+from page_cache import etag_matches
+from pages import templates, page_cache, optional_int
+from database import SessionLocal, get_db, get_read_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Incident listing page size (keyset pagination)
+INCIDENTS_PAGE_SIZE = 50
+MAX_INCIDENTS_PAGE_SIZE = 200
+
+# Admin Dashboard & CRUD Modules
+@router.get("/admindashboard", response_class=HTMLResponse)
+async def admin_dashboard(request: Request, user: Identity = Depends(require_role("admin"))):
+    return page_cache.render(request, "admindashboard.html")
+
+# Staff Members (create, list, update, delete)
+@router.get("/staffmembers", response_class=HTMLResponse)
+async def staffmembers_form(
+    request: Request,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    try:
+        etag = page_cache.versioned_etag(
+            request, "staffmembers.html", await async_crud.get_table_versions(db, "staff_members")
+        )
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        staff_members = await async_crud.get_all_staff(db)
+        return templates.TemplateResponse("staffmembers.html", {
+            "request": request,
+            "staff_members": staff_members
+        }, headers=headers)
+    except Exception as e:
+        logger.error("Error fetching staff members: %s", e)
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "message": f"Error fetching staff members: {str(e)}"},
+            status_code=500
+        )
+
+@router.post("/add_staff", response_class=HTMLResponse)
+async def add_staff(
+    request: Request,
+    name: str = Form(...),
+    username: str = Form(...),
+    password: str = Form(...),
+    role: str = Form(...),
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_db)
+):
+    try:
+        await async_crud.create_staff_member(
+            db,
+            schemas.StaffMemberCreate(name=name, username=username, password=password, role=role)
+        )
+        logger.info("Staff added: %s, role: %s", username, role)
+        return RedirectResponse(url="/staffmembers?message=Staff added successfully", status_code=303)
+    except Exception as e:
+        logger.error("Error adding staff: %s", e)
+        staff_members = await async_crud.get_all_staff(db)
+        return templates.TemplateResponse(
+            "staffmembers.html",
+            {
+                "request": request,
+                "error": f"Error adding staff: {str(e)}",
+                "staff_members": staff_members
+            },
+            status_code=400
+        )
+
+@router.get("/edit_staff/{staff_id}", response_class=HTMLResponse)
+async def edit_staff_form(
+    request: Request,
+    staff_id: int,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    try:
+        staff = await async_crud.get_staff_by_id(db, staff_id)
+        if not staff:
+            logger.error("Staff not found: ID %s", staff_id)
+            return templates.TemplateResponse(
+                "error.html",
+                {"request": request, "message": "Staff not found"},
+                status_code=404
+            )
+        return templates.TemplateResponse("edit_staff.html", {
+            "request": request,
+            "staff": staff
+        })
+    except Exception as e:
+        logger.error("Error fetching staff for edit: %s", e)
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "message": f"Error: {str(e)}"},
+            status_code=500
+        )
+
+@router.post("/edit_staff/{staff_id}", response_class=HTMLResponse)
+async def update_staff(
+    request: Request,
+    staff_id: int,
+    name: str = Form(...),
+    username: str = Form(...),
+    password: str = Form(""),  # blank keeps the current password
+    role: str = Form(...),
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_db)
+):
+    try:
+        updated_staff = await async_crud.update_staff_member(
+            db,
+            staff_id,
+            schemas.StaffMemberCreate(name=name, username=username, password=password, role=role)
+        )
+        if not updated_staff:
+            logger.error("Staff not found for update: ID %s", staff_id)
+            return templates.TemplateResponse(
+                "error.html",
+                {"request": request, "message": "Staff not found"},
+                status_code=404
+            )
+        logger.info("Staff updated: ID %s", staff_id)
+        return RedirectResponse(url="/staffmembers?message=Staff updated successfully", status_code=303)
+    except Exception as e:
+        logger.error("Error updating staff: %s", e)
+        staff = await async_crud.get_staff_by_id(db, staff_id)
+        return templates.TemplateResponse(
+            "edit_staff.html",
+            {
+                "request": request,
+                "error": f"Error updating staff: {str(e)}",
+                "staff": staff
+            },
+            status_code=400
+        )
+
+@router.post("/delete_staff/{staff_id}", response_class=HTMLResponse)
+async def delete_staff(
+    request: Request,
+    staff_id: int,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_db)
+):
+    try:
+        success = await async_crud.delete_staff_member(db, staff_id)
+        if not success:
+            logger.error("Staff not found for deletion: ID %s", staff_id)
+            return templates.TemplateResponse(
+                "error.html",
+                {"request": request, "message": "Staff not found"},
+                status_code=404
+            )
+        logger.info("Staff deleted: ID %s", staff_id)
+        return RedirectResponse(url="/staffmembers?message=Staff deleted successfully", status_code=303)
+    except Exception as e:
+        logger.error("Error deleting staff: %s", e)
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "message": f"Error: {str(e)}"},
+            status_code=500
+        )
+
+# Students (create, list, update, delete)
+@router.get("/students", response_class=HTMLResponse)
+async def students_form(
+    request: Request,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    try:
+        # Unchanged table: 304 from the version counter, no student rows read
+        etag = page_cache.versioned_etag(request, "students.html", await async_crud.get_table_versions(db, "students"))
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        students = await async_crud.get_all_students(db)
+        return templates.TemplateResponse("students.html", {
+            "request": request,
+            "students": students
+        }, headers=headers)
+    except Exception as e:
+        logger.error("Error fetching students: %s", e)
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "message": f"Error: {str(e)}"},
+            status_code=500
+        )
+
+@router.post("/add_student", response_class=HTMLResponse)
+async def add_student(
+    request: Request,
+    name: str = Form(...),
+    username: str = Form(...),
+    password: str = Form(...),
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_db)
+):
+    try:
+        await async_crud.create_student(
+            db,
+            schemas.StudentCreate(name=name, username=username, password=password)
+        )
+        logger.info("Student added: %s", username)
+        return RedirectResponse(url="/students?message=Student added successfully", status_code=303)
+    except Exception as e:
+        logger.error("Error adding student: %s", e)
+        students = await async_crud.get_all_students(db)
+        return templates.TemplateResponse(
+            "students.html",
+            {
+                "request": request,
+                "error": f"Error adding student: {str(e)}",
+                "students": students
+            },
+            status_code=400
+        )
+
+@router.get("/edit_student/{student_id}", response_class=HTMLResponse)
+async def edit_student_form(
+    request: Request,
+    student_id: int,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    try:
+        student = await async_crud.get_student_by_id(db, student_id)
+        if not student:
+            logger.error("Student not found: ID %s", student_id)
+            return templates.TemplateResponse(
+                "error.html",
+                {"request": request, "message": "Student not found"},
+                status_code=404
+            )
+        return templates.TemplateResponse("edit_student.html", {
+            "request": request,
+            "student": student
+        })
+    except Exception as e:
+        logger.error("Error fetching student for edit: %s", e)
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "message": f"Error: {str(e)}"},
+            status_code=500
+        )
+
+@router.post("/edit_student/{student_id}", response_class=HTMLResponse)
+async def update_student(
+    request: Request,
+    student_id: int,
+    name: str = Form(...),
+    username: str = Form(...),
+    password: str = Form(""),  # blank keeps the current password
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_db)
+):
+    try:
+        updated_student = await async_crud.update_student(
+            db,
+            student_id,
+            schemas.StudentCreate(name=name, username=username, password=password)
+        )
+        if not updated_student:
+            logger.error("Student not found for update: ID %s", student_id)
+            return templates.TemplateResponse(
+                "error.html",
+                {"request": request, "message": "Student not found"},
+                status_code=404
+            )
+        logger.info("Student updated: ID %s", student_id)
+        return RedirectResponse(url="/students?message=Student updated successfully", status_code=303)
+    except Exception as e:
+        logger.error("Error updating student: %s", e)
+        student = await async_crud.get_student_by_id(db, student_id)
+        return templates.TemplateResponse(
+            "edit_student.html",
+            {
+                "request": request,
+                "error": f"Error updating student: {str(e)}",
+                "student": student
+            },
+            status_code=400
+        )
+
+@router.post("/delete_student/{student_id}", response_class=HTMLResponse)
+async def delete_student(
+    request: Request,
+    student_id: int,
+    user: Identity = Depends(require_role("admin")),
+    db: AnySession = Depends(get_db)
+):
+    try:
+        success = await async_crud.delete_student(db, student_id)
+        if not success:
+            logger.error("Student not found for deletion: ID %s", student_id)
+            return templates.TemplateResponse(
+                "error.html",
+                {"request": request, "message": "Student not found"},
+                status_code=404
+            )
+        logger.info("Student deleted: ID %s", student_id)
+        return RedirectResponse(url="/students?message=Student deleted successfully", status_code=303)
+    except Exception as e:
+        logger.error("Error deleting student: %s", e)
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "message": f"Error: {str(e)}"},
+            status_code=500
+        )
+
+# Bulk import of students / staff from CSV or JSONL uploads
+@router.post("/import/{kind}")
+async def import_accounts(
+    kind: str,
+    file: UploadFile = File(...),
+    batch_size: int = Form(None),
+    user: Identity = Depends(require_role("admin"))
+):
+    # Imported on first use: the CSV/JSONL loaders are not needed to serve pages
+    import bulk_import
+
+    if kind not in bulk_import.KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown import kind: {kind}")
+
+    def run_import():
+        with SessionLocal() as db:
+            return bulk_import.import_file(db, kind, file.file, file.filename, batch_size)
+
+    report = await run_in_threadpool(run_import)
+    logger.info("Bulk import of %s by admin: %s inserted, %s errors", kind, report.inserted, report.error_count)
+    return report.as_dict()
+
+# Static Admin Modules
+@router.get("/checkbeststudentawards", response_class=HTMLResponse)
+async def check_best_student_awards(request: Request, user: Identity = Depends(require_role("admin"))):
+    return page_cache.render(request, "checkbeststudentawards.html")
+
+@router.get("/applyscholarship", response_class=HTMLResponse)
+async def apply_scholarship(request: Request, user: Identity = Depends(require_role("admin"))):
+    return page_cache.render(request, "applyscholarship.html")
+
+@router.get("/applybeststudentaward", response_class=HTMLResponse)
+async def apply_best_student_award(request: Request, user: Identity = Depends(require_role("admin"))):
+    return page_cache.render(request, "applybeststudentaward.html")
+
+@router.get("/disciplineincidents", response_class=HTMLResponse)
+async def discipline_incidents(
+    request: Request,
+    after: str = None,
+    limit: int = INCIDENTS_PAGE_SIZE,
+    department: str = None,
+    class_name: str = None,
+    date_from: str = None,
+    date_to: str = None,
+    committee_member_id: str = None,
+    user: Identity = Depends(require_role("principal", "admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    try:
+        after_id = optional_int(after)
+        committee_member_id = optional_int(committee_member_id)
+    except ValueError:
+        logger.warning("Invalid incident filter: after=%r, committee_member_id=%r", after, committee_member_id)
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "message": "Invalid filter: after and committee member ID must be numbers"},
+            status_code=400
+        )
+    try:
+        limit = max(1, min(limit, MAX_INCIDENTS_PAGE_SIZE))
+        filters = {
+            "department": department or None,
+            "class_name": class_name or None,
+            "date_from": date_from or None,
+            "date_to": date_to or None,
+            "committee_member_id": committee_member_id
+        }
+        incidents, next_cursor = await async_crud.get_incidents_page(
+            db, after_id=after_id, limit=limit, **filters
+        )
+        next_url = None
+        if next_cursor:
+            next_url = str(request.url.include_query_params(after=next_cursor, limit=limit))
+        return templates.TemplateResponse("disciplineincidents.html", {
+            "request": request,
+            "incidents": incidents,
+            "filters": filters,
+            "next_url": next_url,
+            "first_url": str(request.url.remove_query_params("after")) if after else None
+        })
+    except Exception as e:
+        logger.error("Error fetching incidents: %s", e)
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "message": f"Error: {str(e)}"},
+            status_code=500
+        )
+
+@router.get("/api/disciplineincidents", response_model=schemas.IncidentPage)
+async def api_discipline_incidents(
+    after: int | None = None,
+    limit: int = Query(INCIDENTS_PAGE_SIZE, ge=1, le=MAX_INCIDENTS_PAGE_SIZE),
+    department: str | None = None,
+    class_name: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    committee_member_id: int | None = None,
+    user: Identity = Depends(require_role("principal", "admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    incidents, next_cursor = await async_crud.get_incidents_page(
+        db,
+        after_id=after,
+        limit=limit,
+        department=department,
+        class_name=class_name,
+        date_from=date_from,
+        date_to=date_to,
+        committee_member_id=committee_member_id
+    )
+    return {"items": incidents, "next_cursor": next_cursor}
+
+@router.get("/severitylevels", response_class=HTMLResponse)
+async def severity_levels(request: Request, user: Identity = Depends(require_role("admin"))):
+    return page_cache.render(request, "severitylevels.html")
+
+@router.get("/checkscholarship", response_class=HTMLResponse)
+async def check_scholarship(request: Request, user: Identity = Depends(require_role("admin"))):
+    return page_cache.render(request, "checkscholarship.html")
+
+@router.get("/departments", response_class=HTMLResponse)
+async def departments(request: Request, user: Identity = Depends(require_role("admin"))):
+    return page_cache.render(request, "departments.html")
+
+@router.get("/classes", response_class=HTMLResponse)
+async def classes(request: Request, user: Identity = Depends(require_role("admin"))):
+    return page_cache.render(request, "classes.html")
@@ -0,0 +1,249 @@
+from fastapi import APIRouter, Depends, Request, Form
+from fastapi.responses import HTMLResponse, RedirectResponse
+import logging
+
+import schemas
+import async_crud
+import idempotency
+from async_crud import AnySession
+from auth import require_role
+from identity import Identity
+from pages import templates, submitted_key
+from database import get_db, get_read_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Committee Dashboard
+@router.get("/committeedashboard", response_class=HTMLResponse)
+async def committee_dashboard(
+    request: Request,
+    user: Identity = Depends(require_role("committee")),
+    db: AnySession = Depends(get_read_db)
+):
+    stats = await async_crud.get_committee_statistics(db, user.id)
+    return templates.TemplateResponse("committeedashboard.html", {
+        "request": request,
+        "staff": user,
+        "stats": stats,
+        "message": request.query_params.get("message")
+    })
+
+# Committee Routes
+@router.get("/cd_disciplineincidents", response_class=HTMLResponse)
+async def cd_view_incidents(
+    request: Request,
+    user: Identity = Depends(require_role("committee")),
+    db: AnySession = Depends(get_read_db)
+):
+    try:
+        incidents = await async_crud.get_incidents_by_committee_member(db, user.id)
+        logger.debug("Fetched %s incidents for committee member ID %s", len(incidents), user.id)
+        return templates.TemplateResponse("cd_disciplineincidents.html", {
+            "request": request,
+            "incidents": incidents,
+            "staff": user,
+            "message": request.query_params.get("message"),
+            "error": request.query_params.get("error")
+        })
+    except Exception as e:
+        logger.error("Error fetching committee discipline incidents: %s", e)
+        return templates.TemplateResponse(
+            "cd_disciplineincidents.html",
+            {
+                "request": request,
+                "error": f"No incidents assigned to you: {str(e)}",
+                "incidents": [],
+                "staff": user
+            },
+            status_code=200
+        )
+
+@router.post("/cd_assign_action", response_class=HTMLResponse)
+async def cd_assign_action(
+    request: Request,
+    incident_id: int = Form(...),
+    student_id: str = Form(...),
+    action_description: str = Form(...),
+    assigned_date: str = Form(...),
+    idempotency_key: str = Form(""),
+    user: Identity = Depends(require_role("committee")),
+    db: AnySession = Depends(get_db)
+):
+    try:
+        action_data = schemas.DisciplinaryActionCreate(
+            incident_id=incident_id,
+            student_id=student_id,
+            action_description=action_description,
+            assigned_date=assigned_date
+        )
+        await async_crud.create_disciplinary_action(
+            db, action_data, submitted_key(request, idempotency_key), owner=f"staff:{user.id}"
+        )
+        logger.info("Action assigned for incident ID %s by user_id: %s", incident_id, user.id)
+        return RedirectResponse(url="/cd_disciplineincidents?message=Action assigned successfully", status_code=303)
+    except idempotency.DuplicateRequest:
+        logger.info("Duplicate action submission ignored for user_id: %s", user.id)
+        return RedirectResponse(url="/cd_disciplineincidents?message=Action assigned successfully", status_code=303)
+    except Exception as e:
+        logger.error("Error assigning action: %s", e)
+        incidents = await async_crud.get_incidents_by_committee_member(db, user.id)
+        return templates.TemplateResponse(
+            "cd_disciplineincidents.html",
+            {
+                "request": request,
+                "error": f"Error assigning action: {str(e)}",
+                "incidents": incidents,
+                "staff": user
+            },
+            status_code=400
+        )
+
+@router.get("/cd_assignactions", response_class=HTMLResponse)
+async def cd_assign_actions(
+    request: Request,
+    user: Identity = Depends(require_role("committee")),
+    db: AnySession = Depends(get_read_db)
+):
+    try:
+        incidents = await async_crud.get_incidents_by_committee_member(db, user.id)
+        logger.debug("Fetched %s incidents for assign actions by user_id: %s", len(incidents), user.id)
+        return templates.TemplateResponse("cd_assignactions.html", {
+            "request": request,
+            "incidents": incidents,
+            "staff": user,
+            "message": request.query_params.get("message"),
+            "error": request.query_params.get("error"),
+            "idempotency_key": idempotency.new_key()
+        })
+    except Exception as e:
+        logger.error("Error fetching assign actions page: %s", e)
+        return templates.TemplateResponse(
+            "cd_assignactions.html",
+            {
+                "request": request,
+                "error": f"No incidents assigned to you: {str(e)}",
+                "incidents": [],
+                "staff": user
+            },
+            status_code=200
+        )
+
+@router.post("/cd_assignactions", response_class=HTMLResponse)
+async def cd_submit_action(
+    request: Request,
+    incident_id: int = Form(...),
+    student_id: str = Form(...),
+    action_description: str = Form(...),
+    assigned_date: str = Form(...),
+    idempotency_key: str = Form(""),
+    user: Identity = Depends(require_role("committee")),
+    db: AnySession = Depends(get_db)
+):
+    try:
+        action_data = schemas.DisciplinaryActionCreate(
+            incident_id=incident_id,
+            student_id=student_id,
+            action_description=action_description,
+            assigned_date=assigned_date
+        )
+        await async_crud.create_disciplinary_action(
+            db, action_data, submitted_key(request, idempotency_key), owner=f"staff:{user.id}"
+        )
+        logger.info("Action assigned for incident ID %s by user_id: %s", incident_id, user.id)
+        return RedirectResponse(url="/cd_assignactions?message=Action assigned successfully", status_code=303)
+    except idempotency.DuplicateRequest:
+        logger.info("Duplicate action submission ignored for user_id: %s", user.id)
+        return RedirectResponse(url="/cd_assignactions?message=Action assigned successfully", status_code=303)
+    except Exception as e:
+        logger.error("Error submitting action: %s", e)
+        incidents = await async_crud.get_incidents_by_committee_member(db, user.id)
+        return templates.TemplateResponse(
+            "cd_assignactions.html",
+            {
+                "request": request,
+                "error": f"Error assigning action: {str(e)}",
+                "incidents": incidents,
+                "staff": user,
+                "idempotency_key": idempotency_key or idempotency.new_key()
+            },
+            status_code=400
+        )
+
+@router.post("/cd_assignactions/batch", response_class=HTMLResponse)
+async def cd_submit_actions_batch(
+    request: Request,
+    incident_ids: list[int] = Form(...),
+    action_description: str = Form(...),
+    assigned_date: str = Form(...),
+    idempotency_key: str = Form(""),
+    user: Identity = Depends(require_role("committee")),
+    db: AnySession = Depends(get_db)
+):
+    # One action for many incidents, written in a single transaction
+    try:
+        assigned = {incident.id: incident for incident in await async_crud.get_incidents_by_committee_member(db, user.id)}
+        unknown = [incident_id for incident_id in incident_ids if incident_id not in assigned]
+        if unknown:
+            raise ValueError(f"Incidents not assigned to you: {', '.join(map(str, unknown))}")
+        actions = [
+            schemas.DisciplinaryActionCreate(
+                incident_id=incident_id,
+                student_id=assigned[incident_id].student_id,
+                action_description=action_description,
+                assigned_date=assigned_date
+            )
+            for incident_id in dict.fromkeys(incident_ids)
+        ]
+        await async_crud.create_disciplinary_actions(
+            db, actions, submitted_key(request, idempotency_key), owner=f"staff:{user.id}"
+        )
+        logger.info("Action assigned for %s incidents by user_id: %s", len(actions), user.id)
+        return RedirectResponse(url=f"/cd_assignactions?message=Action assigned to {len(actions)} incidents", status_code=303)
+    except idempotency.DuplicateRequest:
+        logger.info("Duplicate batch action submission ignored for user_id: %s", user.id)
+        return RedirectResponse(url="/cd_assignactions?message=Actions assigned successfully", status_code=303)
+    except Exception as e:
+        logger.error("Error submitting batch action: %s", e)
+        incidents = await async_crud.get_incidents_by_committee_member(db, user.id)
+        return templates.TemplateResponse(
+            "cd_assignactions.html",
+            {
+                "request": request,
+                "error": f"Error assigning actions: {str(e)}",
+                "incidents": incidents,
+                "staff": user,
+                "idempotency_key": idempotency_key or idempotency.new_key()
+            },
+            status_code=400
+        )
+
+@router.get("/cd_disciplineactions", response_class=HTMLResponse)
+async def cd_discipline_actions(
+    request: Request,
+    user: Identity = Depends(require_role("committee")),
+    db: AnySession = Depends(get_read_db)
+):
+    try:
+        actions = await async_crud.get_all_actions(db)
+        logger.debug("Fetched %s disciplinary actions for user_id: %s", len(actions), user.id)
+        return templates.TemplateResponse("cd_disciplineactions.html", {
+            "request": request,
+            "actions": actions,
+            "staff": user,
+            "message": request.query_params.get("message"),
+            "error": request.query_params.get("error")
+        })
+    except Exception as e:
+        logger.error("Error fetching discipline actions: %s", e)
+        return templates.TemplateResponse(
+            "cd_disciplineactions.html",
+            {
+                "request": request,
+                "error": f"No disciplinary actions available: {str(e)}",
+                "actions": [],
+                "staff": user
+            },
+            status_code=200
+        )
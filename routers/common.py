@@ -0,0 +1,187 @@
+from fastapi import APIRouter, Depends, Request, Form, HTTPException, Query
+from fastapi.responses import HTMLResponse, PlainTextResponse, RedirectResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+import logging
+
+import settings
+import async_crud
+import metrics
+from async_crud import AnySession
+from auth import require_role, set_session_cookie, clear_session_cookie
+from identity import Identity
+from passwords import hash_password, verify_cache
+from pages import templates, page_cache
+from database import all_pool_stats, get_db, get_read_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# -------------------- Metrics --------------------
+
+# Prometheus scrape endpoint: request, SQL, pool and template metrics
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    lines = ["# HELP db_pool_checked_out Connections currently checked out", "# TYPE db_pool_checked_out gauge"]
+    for name, stats in all_pool_stats().items():
+        if "checkedout" in stats:
+            lines.append(f'db_pool_checked_out{{pool="{name}"}} {stats["checkedout"]}')
+    return PlainTextResponse(metrics.render_metrics(lines), media_type="text/plain; version=0.0.4")
+
+# Connection pool statistics for the configured engines
+@router.get("/metrics/pool")
+async def pool_metrics():
+    return all_pool_stats()
+
+# SQL profiler reports (only with SQL_PROFILE enabled). Statements and their
+# parameters are sensitive, so the reports are admin-only.
+if settings.SQL_PROFILE:
+    import sql_profiler
+
+    @router.get("/debug/sql")
+    async def sql_profiles(user: Identity = Depends(require_role("admin"))):
+        return sql_profiler.profiles.recent()
+
+    @router.get("/debug/sql/{request_id}")
+    async def sql_profile(request_id: str, user: Identity = Depends(require_role("admin"))):
+        profile = sql_profiler.profiles.get(request_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="No SQL profile for this request")
+        return profile.report()
+
+# -------------------- Home & Login --------------------
+
+@router.get("/", response_class=HTMLResponse)
+async def show_home(request: Request):
+    return page_cache.render(request, "home.html")
+
+@router.get("/login", response_class=HTMLResponse)
+async def show_login(request: Request):
+    return page_cache.render(request, "login.html")
+
+# Login Handler (Admin / Student / Staff)
+@router.post("/login", response_class=HTMLResponse)
+async def login(
+    request: Request,
+    username: str = Form(...),
+    password: str = Form(...),
+    db: AnySession = Depends(get_db)
+):
+    logger.debug("Login attempt for username: %s", username)
+    # Admin login
+    if username == "admin" and password == "admin":
+        logger.info("Admin login successful")
+        return set_session_cookie(
+            RedirectResponse(url="/admindashboard", status_code=303),
+            Identity(id=0, name="admin", role="admin")
+        )
+
+    if verify_cache.is_locked(username):
+        logger.warning("Login locked after repeated failures for username: %s", username)
+        return templates.TemplateResponse(
+            "login.html",
+            {
+                "request": request,
+                "error": "Too many failed attempts. Please try again later."
+            },
+            status_code=429
+        )
+
+    # Student and staff accounts come back from one query, students first
+    for account in await async_crud.get_accounts_by_username(db, username):
+        matches, needs_rehash = await run_in_threadpool(verify_cache.verify, password, account.password)
+        if not matches:
+            continue
+        verify_cache.record_success(username)
+        if needs_rehash:
+            # Legacy plaintext or an outdated work factor: upgrade the stored hash now
+            password_hash = await run_in_threadpool(hash_password, password)
+            await async_crud.set_password_hash(db, account.kind, account.id, password_hash)
+        identity = Identity(id=account.id, name=account.name, role=account.role)
+        logger.info("%s login successful: %s, role: %s", account.kind.title(), username, account.role)
+        return set_session_cookie(
+            RedirectResponse(url=f"/{account.role}dashboard", status_code=303),
+            identity
+        )
+
+    verify_cache.record_failure(username)
+    # Invalid credentials
+    logger.warning("Invalid login attempt for username: %s", username)
+    return templates.TemplateResponse(
+        "login.html",
+        {
+            "request": request,
+            "error": f"Invalid credentials for username: {username}. Please try again."
+        },
+        status_code=401
+    )
+
+# Logout Route
+@router.get("/logout", response_class=RedirectResponse)
+async def logout(request: Request):
+    logger.info("User logged out")
+    return clear_session_cookie(RedirectResponse(url="/login", status_code=303))
+
+# -------------------- Reports (principal, committee, admin) --------------------
+
+# Full-text search over incident or action descriptions, best matches first.
+# Snippets are HTML-escaped with matches wrapped in <mark>.
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+@router.get("/api/search")
+async def search_descriptions(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: str = Query("incidents", pattern="^(incidents|actions)$"),
+    department: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    limit: int = Query(SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    user: Identity = Depends(require_role("principal", "committee", "admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    hits = await async_crud.search_descriptions(
+        db, q, kind=kind, department=department, date_from=date_from, date_to=date_to, limit=limit
+    )
+    return {"query": q, "kind": kind, "items": hits}
+
+# Dashboard statistics as JSON: everything for the principal and admin,
+# the caller's own workload for a committee member
+@router.get("/api/statistics")
+async def statistics(
+    user: Identity = Depends(require_role("principal", "committee", "admin")),
+    db: AnySession = Depends(get_read_db)
+):
+    if user.role == "committee":
+        return await async_crud.get_committee_statistics(db, user.id)
+    return await async_crud.get_statistics(db)
+
+# Streaming CSV / NDJSON export of incidents and disciplinary actions
+@router.get("/export/{kind}")
+async def export_records(
+    kind: str,
+    format: str = "csv",
+    student_id: str = None,
+    date_from: str = None,
+    date_to: str = None,
+    department: str = None,
+    class_name: str = None,
+    committee_member_id: int = None,
+    incident_id: int = None,
+    user: Identity = Depends(require_role("principal", "admin"))
+):
+    import export
+
+    if kind not in export.EXPORTS or format not in export.FORMATS:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {kind} as {format}")
+    filters = {"student_id": student_id, "date_from": date_from, "date_to": date_to}
+    if kind == "incidents":
+        filters.update(department=department, class_name=class_name, committee_member_id=committee_member_id)
+    else:
+        filters.update(incident_id=incident_id)
+    logger.info("Export of %s as %s by user_id: %s", kind, format, user.id)
+    return StreamingResponse(
+        export.stream_export(kind, format, filters),
+        media_type=export.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{format}"'}
+    )
@@ -0,0 +1,161 @@
+from fastapi import APIRouter, Depends, Request, Form
+from fastapi.responses import HTMLResponse, RedirectResponse
+import logging
+
+import schemas
+import settings
+import async_crud
+import idempotency
+from async_crud import AnySession
+from auth import require_role
+from identity import Identity
+from pages import templates, page_cache, submitted_key
+from database import get_db, get_read_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Faculty Dashboard
+@router.get("/facultydashboard", response_class=HTMLResponse)
+async def faculty_dashboard(request: Request, user: Identity = Depends(require_role("faculty"))):
+    return page_cache.render(request, "facultydashboard.html", {
+        "staff": user
+    }, ttl=settings.PAGE_CACHE_USER_TTL, user=user)
+
+# Faculty Routes
+@router.get("/fd_disciplineincidents", response_class=HTMLResponse)
+async def fd_discipline_incidents(
+    request: Request,
+    user: Identity = Depends(require_role("faculty")),
+    db: AnySession = Depends(get_read_db)
+):
+    try:
+        students = await async_crud.get_all_students(db)
+        staff_directory = await async_crud.get_staff_directory(db)
+        committee_members = staff_directory.members("committee")
+        return templates.TemplateResponse("fd_disciplineincidents.html", {
+            "request": request,
+            "students": students,
+            "committee_members": committee_members,
+            "staff": user,
+            "message": request.query_params.get("message"),
+            "form_data": {},
+            "idempotency_key": idempotency.new_key()
+        })
+    except Exception as e:
+        logger.error("Error fetching faculty discipline incidents: %s", e)
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "message": f"Error: {str(e)}"},
+            status_code=500
+        )
+
+@router.post("/fd_submit_incident", response_class=HTMLResponse)
+async def fd_submit_incident(
+    request: Request,
+    student_id: str = Form(...),
+    student_name: str = Form(...),
+    class_name: str = Form(...),
+    department: str = Form(...),
+    committee_member_id: str = Form(...),  # Changed to str to avoid type mismatch
+    incident_date: str = Form(...),
+    description: str = Form(...),
+    idempotency_key: str = Form(""),
+    user: Identity = Depends(require_role("faculty")),
+    db: AnySession = Depends(get_db)
+):
+    try:
+        # Validate committee_member_id
+        committee_member_id_int = int(committee_member_id) if committee_member_id else None
+        if committee_member_id_int:
+            staff_directory = await async_crud.get_staff_directory(db)
+            committee_member = staff_directory.member(committee_member_id_int)
+            if not committee_member or committee_member.role != "committee":
+                raise ValueError(f"Invalid committee member ID: {committee_member_id}")
+        # Create incident
+        incident_data = schemas.IncidentCreate(
+            student_id=student_id,
+            student_name=student_name,
+            class_name=class_name,
+            department=department,
+            committee_member_id=committee_member_id_int,
+            incident_date=incident_date,
+            description=description
+        )
+        logger.debug("Incident data: %s", incident_data)
+        await async_crud.create_incident(
+            db, incident_data, submitted_key(request, idempotency_key), owner=f"staff:{user.id}"
+        )
+        logger.info("Incident reported by user_id: %s", user.id)
+        return RedirectResponse(url="/fd_disciplineincidents?message=Incident reported successfully", status_code=303)
+    except idempotency.DuplicateRequest:
+        # Double submit of a form already applied: same outcome as the first time
+        logger.info("Duplicate incident submission ignored for user_id: %s", user.id)
+        return RedirectResponse(url="/fd_disciplineincidents?message=Incident reported successfully", status_code=303)
+    except ValueError as ve:
+        logger.error("Validation error: %s", ve)
+        students = await async_crud.get_all_students(db)
+        staff_directory = await async_crud.get_staff_directory(db)
+        committee_members = staff_directory.members("committee")
+        form_data = {
+            "student_id": student_id,
+            "student_name": student_name,
+            "class_name": class_name,
+            "department": department,
+            "committee_member_id": committee_member_id,
+            "incident_date": incident_date,
+            "description": description
+        }
+        return templates.TemplateResponse(
+            "fd_disciplineincidents.html",
+            {
+                "request": request,
+                "error": f"Validation error: {str(ve)}",
+                "students": students,
+                "committee_members": committee_members,
+                "staff": user,
+                "form_data": form_data,
+                "idempotency_key": idempotency_key or idempotency.new_key()
+            },
+            status_code=400
+        )
+    except Exception as e:
+        logger.error("Error reporting incident: %s", e)
+        students = await async_crud.get_all_students(db)
+        staff_directory = await async_crud.get_staff_directory(db)
+        committee_members = staff_directory.members("committee")
+        form_data = {
+            "student_id": student_id,
+            "student_name": student_name,
+            "class_name": class_name,
+            "department": department,
+            "committee_member_id": committee_member_id,
+            "incident_date": incident_date,
+            "description": description
+        }
+        return templates.TemplateResponse(
+            "fd_disciplineincidents.html",
+            {
+                "request": request,
+                "error": f"Error reporting incident: {str(e)}",
+                "students": students,
+                "committee_members": committee_members,
+                "staff": user,
+                "form_data": form_data,
+                "idempotency_key": idempotency_key or idempotency.new_key()
+            },
+            status_code=500
+        )
+
+@router.get("/fd_applybeststudentaward", response_class=HTMLResponse)
+async def fd_best_award(request: Request, user: Identity = Depends(require_role("faculty"))):
+    return page_cache.render(request, "fd_applybeststudentaward.html", {
+        "user_id": user.id
+    }, ttl=settings.PAGE_CACHE_USER_TTL, user=user)
+
+@router.get("/fd_applyscholarship", response_class=HTMLResponse)
+async def fd_scholarship(request: Request, user: Identity = Depends(require_role("faculty"))):
+    return page_cache.render(request, "fd_applyscholarship.html", {
+        "user_id": user.id
+    }, ttl=settings.PAGE_CACHE_USER_TTL, user=user)
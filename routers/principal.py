@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import HTMLResponse
+import logging
+
+import settings
+import async_crud
+from async_crud import AnySession
+from auth import require_role
+from identity import Identity
+from pages import templates, page_cache
+from database import get_read_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Principal Dashboard
+@router.get("/principaldashboard", response_class=HTMLResponse)
+async def principal_dashboard(
+    request: Request,
+    user: Identity = Depends(require_role("principal")),
+    db: AnySession = Depends(get_read_db)
+):
+    stats = await async_crud.get_statistics(db)
+    return templates.TemplateResponse("principaldashboard.html", {
+        "request": request,
+        "staff": user,
+        "stats": stats
+    })
+
+# Principal Routes
+@router.get("/pd_checkbeststudentawards", response_class=HTMLResponse)
+async def pd_best_awards(request: Request, user: Identity = Depends(require_role("principal"))):
+    return page_cache.render(request, "pd_checkbeststudentawards.html", {
+        "nominations": [],
+        "user_id": user.id
+    }, ttl=settings.PAGE_CACHE_USER_TTL, user=user)
+
+@router.get("/pd_disciplineactions", response_class=HTMLResponse)
+async def pd_discipline_actions(
+    request: Request,
+    user: Identity = Depends(require_role("principal")),
+    db: AnySession = Depends(get_read_db)
+):
+    try:
+        actions = await async_crud.get_all_actions(db)
+        return templates.TemplateResponse("pd_disciplineactions.html", {
+            "request": request,
+            "actions": actions,
+            "staff": user
+        })
+    except Exception as e:
+        logger.error("Error fetching principal discipline actions: %s", e)
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "message": f"Error: {str(e)}"},
+            status_code=500
+        )
+
+
+@router.get("/pd_checkscholarship", response_class=HTMLResponse)
+async def pd_check_scholarship(request: Request, user: Identity = Depends(require_role("principal"))):
+    return page_cache.render(request, "pd_checkscholarship.html", {
+        "scholarships": [],
+        "user_id": user.id
+    }, ttl=settings.PAGE_CACHE_USER_TTL, user=user)
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import HTMLResponse
+import logging
+
+import settings
+import async_crud
+from async_crud import AnySession
+from auth import require_role
+from identity import Identity
+from pages import templates, page_cache
+from database import get_read_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Student Dashboard
+@router.get("/studentdashboard", response_class=HTMLResponse)
+async def student_dashboard(request: Request, user: Identity = Depends(require_role("student"))):
+    return page_cache.render(request, "studentdashboard.html", {
+        "student": user
+    }, ttl=settings.PAGE_CACHE_USER_TTL, user=user)
+
+# Student Routes
+@router.get("/sd_disciplineincidents", response_class=HTMLResponse)
+async def sd_discipline_incidents(
+    request: Request,
+    user: Identity = Depends(require_role("student")),
+    db: AnySession = Depends(get_read_db)
+):
+    try:
+        incidents = await async_crud.get_incidents_by_student_id(db, str(user.id))
+        return templates.TemplateResponse("sd_disciplineincidents.html", {
+            "request": request,
+            "incidents": incidents,
+            "student": user
+        })
+    except Exception as e:
+        logger.error("Error fetching student discipline incidents: %s", e)
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "message": f"Error: {str(e)}"},
+            status_code=500
+        )
+
+@router.get("/sd_viewdisciplineactions", response_class=HTMLResponse)
+async def sd_view_actions(
+    request: Request,
+    user: Identity = Depends(require_role("student")),
+    db: AnySession = Depends(get_read_db)
+):
+    try:
+        actions = await async_crud.get_actions_by_student_id(db, str(user.id))
+        return templates.TemplateResponse("sd_viewdisciplineactions.html", {
+            "request": request,
+            "actions": actions,
+            "student": user
+        })
+    except Exception as e:
+        logger.error("Error fetching student discipline actions: %s", e)
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "message": f"Error: {str(e)}"},
+            status_code=500
+        )
+
+@router.get("/sd_applyscholarship", response_class=HTMLResponse)
+async def sd_apply_scholarship(request: Request, user: Identity = Depends(require_role("student"))):
+    return page_cache.render(
+        request, "sd_applyscholarship.html", {"student": user}, ttl=settings.PAGE_CACHE_USER_TTL, user=user
+    )
+
+@router.get("/sd_applyaward", response_class=HTMLResponse)
+async def sd_apply_award(request: Request, user: Identity = Depends(require_role("student"))):
+    return page_cache.render(
+        request, "sd_applyaward.html", {"student": user}, ttl=settings.PAGE_CACHE_USER_TTL, user=user
+    )
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+STAFF_ROLES = ("principal", "faculty", "committee")
 
 class StaffMemberCreate(BaseModel):
        name: str
@@ -23,4 +25,45 @@ class DisciplinaryActionCreate(BaseModel):
        incident_id: int
        student_id: str
        action_description: str
-       assigned_date: str
\ No newline at end of file
+       assigned_date: str
+
+class IncidentOut(IncidentCreate):
+       model_config = ConfigDict(from_attributes=True)
+
+       id: int
+
+class IncidentPage(BaseModel):
+       items: list[IncidentOut]
+       next_cursor: int | None
+
+class StaffMemberOut(BaseModel):
+       model_config = ConfigDict(from_attributes=True)
+
+       id: int
+       name: str
+       username: str
+       role: str
+
+class StudentOut(BaseModel):
+       model_config = ConfigDict(from_attributes=True)
+
+       id: int
+       name: str
+       username: str
+
+class DisciplinaryActionOut(DisciplinaryActionCreate):
+       model_config = ConfigDict(from_attributes=True)
+
+       id: int
+
+class StaffPage(BaseModel):
+       items: list[StaffMemberOut]
+       next_cursor: int | None
+
+class StudentPage(BaseModel):
+       items: list[StudentOut]
+       next_cursor: int | None
+
+class ActionPage(BaseModel):
+       items: list[DisciplinaryActionOut]
+       next_cursor: int | None
@@ -0,0 +1,205 @@
+import html
+import logging
+import re
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+# Full-text search over incident and action descriptions.
+#   PostgreSQL: GIN index on to_tsvector('english', ...), ts_rank, ts_headline
+#   SQLite:     external-content FTS5 tables kept in sync by triggers, bm25
+#   Otherwise:  a LIKE scan, correct but unindexed
+# Both indexes are created by migration 4 (setup_search).
+
+# Matches are wrapped in these control characters (by ts_headline or
+# mark_words), then the snippet is HTML-escaped and they become <mark> tags, so stored text can
+# never inject markup into the page.
+MARK_START = "\x02"
+MARK_END = "\x03"
+
+SNIPPET_CHARS = 160
+
+SEARCHABLE = {
+    # kind: (table, text column, date column)
+    "incidents": ("discipline_incidents", "description", "incident_date"),
+    "actions": ("disciplinary_actions", "action_description", "assigned_date"),
+}
+
+# -------------------- Index setup --------------------
+
+def fts5_available(conn):
+    try:
+        conn.exec_driver_sql("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        conn.exec_driver_sql("DROP TABLE temp.fts5_probe")
+        return True
+    except Exception:
+        return False
+
+def setup_search(conn):
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        for table, column, _ in SEARCHABLE.values():
+            conn.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_fts "
+                f"ON {table} USING GIN (to_tsvector('english', {column}))"
+            )
+    elif dialect == "sqlite" and fts5_available(conn):
+        for table, column, _ in SEARCHABLE.values():
+            fts = f"{table}_fts"
+            conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} "
+                f"USING fts5({column}, content='{table}', content_rowid='id', tokenize='porter')"
+            )
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END"
+            )
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); END"
+            )
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column} ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+                f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END"
+            )
+            # Index the rows that existed before the triggers
+            conn.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+    else:
+        logger.warning("No full-text index for %s; search will scan with LIKE", dialect)
+
+# -------------------- Queries --------------------
+
+_backends = {}
+
+def backend(db: Session):
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key not in _backends:
+        if bind.dialect.name == "postgresql":
+            _backends[key] = "postgresql"
+        elif bind.dialect.name == "sqlite" and db.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE name = 'discipline_incidents_fts'"
+        )).first():
+            _backends[key] = "fts5"
+        else:
+            _backends[key] = "like"
+    return _backends[key]
+
+def fts5_query(words):
+    # Plain words only, each quoted, all required: user input cannot hit FTS5
+    # query syntax errors. The porter tokenizer matches other word forms.
+    return " ".join(f'"{word}"' for word in words)
+
+def highlight(snippet: str | None):
+    escaped = html.escape(snippet or "")
+    return escaped.replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+def mark_words(value: str, words, width: int = SNIPPET_CHARS):
+    # Python-side snippet for SQLite/LIKE. snippet() would need another FTS5
+    # lookup per hit, which is slow for prefix queries. Words match by prefix
+    # with a few trailing letters dropped, a rough stand-in for stemming.
+    stems = [word[:max(4, len(word) - 3)] for word in words]
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(stem) for stem in stems) + r")\w*", re.IGNORECASE)
+    first = pattern.search(value)
+    begin = max(0, first.start() - width // 3) if first and len(value) > width else 0
+    fragment = value[begin:begin + width]
+    marked = pattern.sub(lambda m: MARK_START + m.group(0) + MARK_END, fragment)
+    return ("…" if begin else "") + marked + ("…" if begin + width < len(value) else "")
+
+def _filters(kind: str, params: dict, department, date_from, date_to):
+    _, _, date_column = SEARCHABLE[kind]
+    clauses = []
+    if department:
+        params["department"] = department
+        if kind == "incidents":
+            clauses.append("t.department = :department")
+        else:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM discipline_incidents i WHERE i.id = t.incident_id "
+                "AND i.department = :department)"
+            )
+    if date_from:
+        params["date_from"] = date_from
+        clauses.append(f"t.{date_column} >= :date_from")
+    if date_to:
+        params["date_to"] = date_to
+        clauses.append(f"t.{date_column} <= :date_to")
+    return "".join(f" AND {clause}" for clause in clauses)
+
+def _postgresql_statement(table: str, column: str, filters: str):
+    # Newest matches first (GIN index), ts_rank over that window only, then
+    # ts_headline for the rows actually returned
+    query = "websearch_to_tsquery('english', :q)"
+    return (
+        f"SELECT ranked.*, ts_headline('english', ranked.{column}, {query}, "
+        f"'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=30, MinWords=10') AS snippet "
+        f"FROM (SELECT candidates.*, ts_rank(to_tsvector('english', candidates.{column}), {query}) AS rank "
+        f"FROM (SELECT t.* FROM {table} t WHERE to_tsvector('english', t.{column}) @@ {query}{filters} "
+        f"ORDER BY t.id DESC LIMIT :candidates) candidates "
+        f"ORDER BY rank DESC, candidates.id DESC LIMIT :limit) ranked "
+        f"ORDER BY ranked.rank DESC, ranked.id DESC"
+    )
+
+def _fts5_statement(table: str, filters: str):
+    # One pass over the newest :candidates matches (FTS5 walks rowids in
+    # descending order and stops at the LIMIT), scoring only those with bm25(),
+    # then the best :limit of them. The base table is joined before the LIMIT
+    # only when a filter needs its columns. bm25() is lower for better
+    # matches, so rank is negated to make higher mean better.
+    fts = f"{table}_fts"
+    join = f" JOIN {table} t ON t.id = {fts}.rowid" if filters else ""
+    return (
+        f"SELECT t.*, -ranked.score AS rank FROM ("
+        f"SELECT id, score FROM ("
+        f"SELECT {fts}.rowid AS id, bm25({fts}) AS score FROM {fts}{join} "
+        f"WHERE {fts} MATCH :q{filters} ORDER BY {fts}.rowid DESC LIMIT :candidates"
+        f") ORDER BY score, id DESC LIMIT :limit) ranked "
+        f"JOIN {table} t ON t.id = ranked.id ORDER BY ranked.score, t.id DESC"
+    )
+
+def search(
+    db: Session,
+    q: str,
+    kind: str = "incidents",
+    department: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    limit: int = 20
+):
+    table, column, _ = SEARCHABLE[kind]
+    words = re.findall(r"\w+", q)
+    if not words:
+        return []
+    params = {"limit": limit, "candidates": max(limit, settings.SEARCH_RANK_CANDIDATES)}
+    filters = _filters(kind, params, department, date_from, date_to)
+    engine = backend(db)
+
+    if engine == "postgresql":
+        params["q"] = q
+        statement = _postgresql_statement(table, column, filters)
+    elif engine == "fts5":
+        params["q"] = fts5_query(words)
+        statement = _fts5_statement(table, filters)
+    else:
+        likes = []
+        for i, word in enumerate(words):
+            params[f"w{i}"] = f"%{word}%"
+            likes.append(f"t.{column} LIKE :w{i}")
+        statement = (
+            f"SELECT t.*, 0 AS rank FROM {table} t "
+            f"WHERE {' AND '.join(likes)}{filters} ORDER BY t.id DESC LIMIT :limit"
+        )
+
+    hits = []
+    for row in db.execute(text(statement), params).mappings():
+        hit = dict(row)
+        hit["rank"] = float(hit["rank"] or 0)
+        snippet = hit["snippet"] if engine == "postgresql" else mark_words(hit[column], words)
+        hit["snippet"] = highlight(snippet)
+        hits.append(hit)
+    return hits
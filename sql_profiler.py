@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+import settings
+from logging_setup import request_id
+
+logger = logging.getLogger(__name__)
+
+# Opt-in (SQL_PROFILE=1) capture of every statement a request runs, with
+# timing and the database's plan, flagging N+1 patterns and duplicate lookups.
+# Reports are kept for the most recent requests and served at /debug/sql.
+
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+    "mysql": "EXPLAIN ",
+}
+
+class RequestProfile:
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route = None
+        self.statements = []
+
+    def add(self, sql: str, params, seconds: float, explain):
+        self.statements.append({
+            "sql": sql,
+            "params": repr(params)[:200],
+            "ms": round(seconds * 1000, 3),
+            "explain": explain,
+        })
+
+    def findings(self):
+        by_sql = Counter(entry["sql"] for entry in self.statements)
+        by_call = Counter((entry["sql"], entry["params"]) for entry in self.statements)
+        # Same statement shape over and over (one per parent row) is the N+1 signature;
+        # the same statement with the same parameters is a lookup done twice
+        repeated = [
+            {"sql": sql, "count": count}
+            for sql, count in by_sql.items() if count >= settings.SQL_PROFILE_REPEAT_THRESHOLD
+        ]
+        duplicates = [
+            {"sql": sql, "params": params, "count": count}
+            for (sql, params), count in by_call.items() if count > 1
+        ]
+        return repeated, duplicates
+
+    def summary(self):
+        repeated, duplicates = self.findings()
+        return {
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "query_count": len(self.statements),
+            "total_ms": round(sum(entry["ms"] for entry in self.statements), 3),
+            "repeated": len(repeated),
+            "duplicates": len(duplicates),
+        }
+
+    def report(self):
+        repeated, duplicates = self.findings()
+        return dict(self.summary(), statements=self.statements, repeated=repeated, duplicates=duplicates)
+
+current_profile: ContextVar[RequestProfile | None] = ContextVar("current_profile", default=None)
+
+class ProfileStore:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, rid: str, profile: RequestProfile):
+        with self._lock:
+            self._profiles[rid] = profile
+            while len(self._profiles) > self.maxsize:
+                self._profiles.popitem(last=False)
+
+    def get(self, rid: str):
+        with self._lock:
+            return self._profiles.get(rid)
+
+    def recent(self):
+        with self._lock:
+            items = list(self._profiles.items())
+        return [dict(profile.summary(), request_id=rid) for rid, profile in reversed(items)]
+
+profiles = ProfileStore(settings.SQL_PROFILE_HISTORY)
+
+# -------------------- Instrumentation --------------------
+
+def _explain(conn, statement: str, parameters):
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    # A separate raw cursor, so the statement's own result set is untouched
+    # and the EXPLAIN does not show up in the profile itself
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [" ".join(str(col) for col in row) for row in cursor.fetchall()]
+    except Exception as e:
+        return [f"EXPLAIN failed: {e}"]
+    finally:
+        cursor.close()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_profile.get() is not None:
+        conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    if profile is None:
+        return
+    elapsed = time.perf_counter() - conn.info["profile_start"].pop()
+    explain = None
+    if settings.SQL_PROFILE_EXPLAIN and not executemany:
+        explain = _explain(conn, statement, parameters)
+    profile.add(statement, parameters, elapsed, explain)
+
+def instrument_engine(engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+class SQLProfilerMiddleware:
+    # Summary goes out in X-SQL-* response headers; the full report (statements,
+    # timings, plans, findings) is at /debug/sql/{request id}
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/debug/"):
+            return await self.app(scope, receive, send)
+        profile = RequestProfile(scope["method"], scope["path"])
+        token = current_profile.set(profile)
+        rid = request_id.get()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                summary = profile.summary()
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-sql-count", str(summary["query_count"]).encode()),
+                    (b"x-sql-time-ms", str(summary["total_ms"]).encode()),
+                    (b"x-sql-findings", f"repeated={summary['repeated']} duplicates={summary['duplicates']}".encode()),
+                    (b"x-sql-report", f"/debug/sql/{rid}".encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(token)
+            route = scope.get("route")
+            profile.route = route.path if route is not None else None
+            profiles.add(rid, profile)
+            summary = profile.summary()
+            if summary["repeated"] or summary["duplicates"]:
+                logger.warning(
+                    "SQL findings for %s %s: %s queries, %s repeated statements, %s duplicate lookups",
+                    profile.method, profile.path, summary["query_count"], summary["repeated"], summary["duplicates"]
+                )
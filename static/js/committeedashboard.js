@@ -0,0 +1,6 @@
+// Sidebar sections of the committee dashboard (navigateSection in dashboard.js)
+window.sectionRoutes = {
+    'disciplineincidents': '/cd_disciplineincidents',
+    'assignactions': '/cd_assignactions',
+    'disciplineactions': '/cd_disciplineactions'
+};
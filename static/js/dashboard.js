@@ -0,0 +1,46 @@
+// Sidebar Toggle
+function toggleSidebar() {
+    document.getElementById('sidebar').classList.toggle('collapsed');
+}
+
+// Theme Toggle
+function toggleTheme() {
+    document.body.classList.toggle('dark-mode');
+    localStorage.setItem('theme', document.body.classList.contains('dark-mode') ? 'dark' : 'light');
+}
+
+// Load Section
+function loadSection(section) {
+    const cards = document.querySelectorAll('.card');
+    cards.forEach(card => {
+        if (card.classList.contains('welcome-card')) return;
+        card.style.display = card.dataset.section === section ? 'block' : 'none';
+    });
+}
+
+// Navigate to Section (pages whose sections are other routes set window.sectionRoutes)
+function navigateSection(section) {
+    const routes = window.sectionRoutes || {};
+    if (routes[section]) {
+        window.location.href = routes[section];
+    } else {
+        console.error(`Invalid section: ${section}`);
+    }
+}
+
+// Search Functionality
+function searchDashboard() {
+    const query = document.getElementById('search-bar').value.toLowerCase();
+    const cards = document.querySelectorAll('.card');
+    cards.forEach(card => {
+        const text = card.textContent.toLowerCase();
+        card.style.display = text.includes(query) ? 'block' : 'none';
+    });
+}
+
+// Initialization
+document.addEventListener('DOMContentLoaded', () => {
+    if (localStorage.getItem('theme') === 'dark') {
+        document.body.classList.add('dark-mode');
+    }
+});
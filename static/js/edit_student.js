@@ -0,0 +1,34 @@
+// Theme Toggle
+function toggleTheme() {
+    document.body.classList.toggle('dark-mode');
+    localStorage.setItem('theme', document.body.classList.contains('dark-mode') ? 'dark' : 'light');
+}
+
+// Form Validation
+function validateForm() {
+    const name = document.getElementById('name').value.trim();
+    const username = document.getElementById('username').value.trim();
+    const password = document.getElementById('password').value;
+
+    if (name.length < 2) {
+        alert('Name must be at least 2 characters long.');
+        return false;
+    }
+    if (username.length < 3) {
+        alert('Username must be at least 3 characters long.');
+        return false;
+    }
+    if (password.length > 0 && password.length < 6) {
+        alert('Password must be at least 6 characters long.');
+        return false;
+    }
+    return true;
+}
+
+// Initialization
+document.addEventListener('DOMContentLoaded', () => {
+    console.log("Edit Student Page loaded successfully!");
+    if (localStorage.getItem('theme') === 'dark') {
+        document.body.classList.add('dark-mode');
+    }
+});
@@ -0,0 +1,6 @@
+// Sidebar sections of the faculty dashboard (navigateSection in dashboard.js)
+window.sectionRoutes = {
+    'disciplineincidents': '/fd_disciplineincidents',
+    'applybeststudentaward': '/fd_applybeststudentaward',
+    'applyscholarship': '/fd_applyscholarship'
+};
@@ -0,0 +1,5 @@
+function updateStudentName(select) {
+    const selectedOption = select.options[select.selectedIndex];
+    const studentName = selectedOption.getAttribute('data-name') || '';
+    document.getElementById('student_name').value = studentName;
+}
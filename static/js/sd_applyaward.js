@@ -0,0 +1,26 @@
+function toggleTheme() {
+    document.body.classList.toggle('dark-mode');
+    localStorage.setItem('theme', document.body.classList.contains('dark-mode') ? 'dark' : 'light');
+}
+
+function validateForm() {
+    const awardType = document.getElementById('award_type').value;
+    const reason = document.getElementById('reason').value.trim();
+
+    if (!awardType) {
+        alert('Please select an award type.');
+        return false;
+    }
+    if (reason.length < 10) {
+        alert('Reason must be at least 10 characters long.');
+        return false;
+    }
+    return true;
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    console.log("Apply Award Page loaded successfully!");
+    if (localStorage.getItem('theme') === 'dark') {
+        document.body.classList.add('dark-mode');
+    }
+});
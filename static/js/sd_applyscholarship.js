@@ -0,0 +1,26 @@
+function toggleTheme() {
+    document.body.classList.toggle('dark-mode');
+    localStorage.setItem('theme', document.body.classList.contains('dark-mode') ? 'dark' : 'light');
+}
+
+function validateForm() {
+    const scholarshipType = document.getElementById('scholarship_type').value;
+    const reason = document.getElementById('reason').value.trim();
+
+    if (!scholarshipType) {
+        alert('Please select a scholarship type.');
+        return false;
+    }
+    if (reason.length < 10) {
+        alert('Reason must be at least 10 characters long.');
+        return false;
+    }
+    return true;
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    console.log("Apply Scholarship Page loaded successfully!");
+    if (localStorage.getItem('theme') === 'dark') {
+        document.body.classList.add('dark-mode');
+    }
+});
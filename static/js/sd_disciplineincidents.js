@@ -0,0 +1,11 @@
+function toggleTheme() {
+    document.body.classList.toggle('dark-mode');
+    localStorage.setItem('theme', document.body.classList.contains('dark-mode') ? 'dark' : 'light');
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    console.log("Student Discipline Incidents Page loaded successfully!");
+    if (localStorage.getItem('theme') === 'dark') {
+        document.body.classList.add('dark-mode');
+    }
+});
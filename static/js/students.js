@@ -0,0 +1,56 @@
+// Theme Toggle
+function toggleTheme() {
+    document.body.classList.toggle('dark-mode');
+    localStorage.setItem('theme', document.body.classList.contains('dark-mode') ? 'dark' : 'light');
+}
+
+// Form Validation
+function validateForm() {
+    const name = document.getElementById('name').value.trim();
+    const username = document.getElementById('username').value.trim();
+    const password = document.getElementById('password').value;
+
+    if (name.length < 2) {
+        alert('Name must be at least 2 characters long.');
+        return false;
+    }
+    if (username.length < 3) {
+        alert('Username must be at least 3 characters long.');
+        return false;
+    }
+    if (password.length < 6) {
+        alert('Password must be at least 6 characters long.');
+        return false;
+    }
+    return true;
+}
+
+// Filter Table
+function filterTable() {
+    var input = document.getElementById("filterInput");
+    var filter = input.value.toLowerCase();
+    var table = document.getElementById("studentTableBody");
+    var tr = table.getElementsByTagName("tr");
+
+    for (var i = 0; i < tr.length; i++) {
+        var tdName = tr[i].getElementsByTagName("td")[0];
+        var tdUsername = tr[i].getElementsByTagName("td")[1];
+        if (tdName || tdUsername) {
+            var nameText = tdName.textContent || tdName.innerText;
+            var usernameText = tdUsername.textContent || tdUsername.innerText;
+            if (nameText.toLowerCase().indexOf(filter) > -1 || usernameText.toLowerCase().indexOf(filter) > -1) {
+                tr[i].style.display = "";
+            } else {
+                tr[i].style.display = "none";
+            }
+        }
+    }
+}
+
+// Initialization
+document.addEventListener('DOMContentLoaded', () => {
+    console.log("Student Management Page loaded successfully!");
+    if (localStorage.getItem('theme') === 'dark') {
+        document.body.classList.add('dark-mode');
+    }
+});
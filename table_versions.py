@@ -0,0 +1,25 @@
+from sqlalchemy import insert, select, update
+
+from models import TableVersion
+
+# Change counters for the tables behind the list pages. Writers bump them in
+# the same transaction as the change, so a reader never pairs a new version
+# with old rows; reading them is a primary-key lookup, which lets a list page
+# answer a conditional GET with 304 without loading its rows.
+
+VERSIONED = ("students", "staff_members")
+
+def create_rows(conn):
+    existing = set(conn.scalars(select(TableVersion.name)))
+    missing = [{"name": name, "version": 0} for name in VERSIONED if name not in existing]
+    if missing:
+        conn.execute(insert(TableVersion), missing)
+
+def bump(db, *tables: str):
+    db.execute(
+        update(TableVersion).where(TableVersion.name.in_(tables)).values(version=TableVersion.version + 1)
+    )
+
+def current(db, *tables: str):
+    versions = dict(db.execute(select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(tables))).all())
+    return tuple(versions.get(table, 0) for table in tables)
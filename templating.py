@@ -0,0 +1,43 @@
+import logging
+import time
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache, Template
+
+import settings
+from assets import asset_url
+from metrics import TEMPLATE_RENDER_SECONDS
+
+logger = logging.getLogger(__name__)
+
+class TimedTemplate(Template):
+    # Both TemplateResponse and PageCache end up in Template.render
+    def render(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            TEMPLATE_RENDER_SECONDS.observe(time.perf_counter() - start, self.name)
+
+def make_templates(directory: str = "templates"):
+    templates = Jinja2Templates(directory=directory)
+    env = templates.env
+    env.auto_reload = settings.TEMPLATE_AUTO_RELOAD
+    env.template_class = TimedTemplate
+    # Stylesheets and scripts live under static/ (see assets.py)
+    env.globals["asset_url"] = asset_url
+    if settings.TEMPLATE_BYTECODE_CACHE:
+        # Compiled templates persist on disk, so a fresh worker loads bytecode
+        # instead of parsing and compiling every template again
+        env.bytecode_cache = FileSystemBytecodeCache(settings.TEMPLATE_BYTECODE_CACHE_DIR)
+    return templates
+
+def warm_up(templates):
+    # Compile (or load from the bytecode cache) every template up front so the
+    # first request to each page does not pay for it
+    start = time.perf_counter()
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.env.get_template(name)
+    logger.info("Warmed %s templates in %.1f ms", len(names), (time.perf_counter() - start) * 1000)
+    return names